@@ -1,4 +1,16 @@
-from .auth import AuthBase, Auth
+from .auth import AuthBase, Auth, UserPool, ShardedAuth
+from .authorization import AuthorizationServer
+from .store import TokenStoreBase, FileTokenStore, SQLiteTokenStore
 from .client import Client, ResourceType
+from .async_client import AsyncClient
+from .loader import CatalogLoader, AsyncCatalogLoader
+from .export import ColumnarExporter
+from .sync import LibraryStore, LibrarySync, SyncReport
+from .search import LibraryIndex
+from .autocomplete import AutocompleteCache, AsyncAutocompleteCache
+from .cache import CacheBase, MemoryCache, SQLiteCache
+from .codec import CodecBase, JSONCodec, OrjsonCodec, MsgspecCodec
+from .retry import RetryPolicy
+from .ratelimit import RateLimiter, TokenBucket, FileTokenBucket
 from .types import *
 from .exceptions import *
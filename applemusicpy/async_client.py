@@ -0,0 +1,299 @@
+import asyncio
+from collections import deque
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from applemusicpy.exceptions import AppleMusicClientException, AppleMusicRequestException
+from .auth import AuthBase
+from .client import Client, ResourceType, VALIDATOR_TTL
+from .stream import DataParser
+
+class AsyncClient(Client):
+    """
+    AsyncClient exposes the same endpoints as Client, but every endpoint
+    returns a coroutine. Requests go through a pooled aiohttp session,
+    so a single event loop can keep many requests in flight:
+
+        async with AsyncClient(auth=auth) as client:
+            albums = await asyncio.gather(*(client.album(id) for id in ids))
+
+    Requires the optional aiohttp dependency.
+    """
+
+    def __init__(self,
+                auth: AuthBase=None,
+                proxies=None,
+                max_retries=10,
+                requests_timeout=None,
+                raw_json=False,
+                workers=8,
+                pool_size=100,
+                cache=None,
+                validators=None,
+                retry=None,
+                rate_limiter=None,
+                users=None,
+                codec=None,
+                single_flight=False,
+                validator_ttl=VALIDATOR_TTL
+                ):
+        if aiohttp is None:
+            raise AppleMusicClientException("AsyncClient requires aiohttp to be installed")
+
+        super().__init__(auth=auth,
+                        proxies=proxies,
+                        requests_session=False,
+                        max_retries=max_retries,
+                        requests_timeout=requests_timeout,
+                        raw_json=raw_json,
+                        workers=workers,
+                        cache=cache,
+                        validators=validators,
+                        retry=retry,
+                        rate_limiter=rate_limiter,
+                        users=users,
+                        codec=codec,
+                        single_flight=single_flight,
+                        validator_ttl=validator_ttl)
+
+        self.pool_size = pool_size
+        self._session = None
+
+    def __enter__(self):
+        raise AppleMusicClientException("AsyncClient has to be used with 'async with'")
+
+    def __exit__(self, *exc_info):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            timeout = aiohttp.ClientTimeout(total=self.requests_timeout)
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    def _get_proxy(self, url):
+        if not self.proxies:
+            return None
+        scheme = url.split(':', 1)[0]
+        return self.proxies.get(scheme)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        super().close()
+
+    async def map(self, calls, workers = None, return_exceptions = False):
+        semaphore = asyncio.Semaphore(max(1, workers or self.workers))
+
+        async def run(call):
+            async with semaphore:
+                return await self._call(call)
+
+        return await asyncio.gather(*(run(call) for call in calls), return_exceptions=return_exceptions)
+
+    async def __call__(self, method, url, params, type = ResourceType.CATALOG, body = None, user = None, stream = False):
+        key, cached = self._cached(method, url, params, type)
+        if cached is not None:
+            return cached
+
+        flight = self._flight_key(method, url, params, type, user, stream)
+        if flight is None:
+            return await self._send(method, url, params, type, body, user, stream, key)
+
+        task = self._inflight.get(flight)
+        if task is None:
+            task = asyncio.ensure_future(self._send(method, url, params, type, body, user, stream, key))
+            self._inflight[flight] = task
+            task.add_done_callback(lambda _: self._inflight.pop(flight, None))
+        # A cancelled caller must not cancel the request other callers wait for
+        return await asyncio.shield(task)
+
+    async def _send(self, method, url, params, type, body, user, stream, key):
+        session = self._get_session()
+
+        deadline = self.retry.start()
+        attempt = 0
+        while True:
+            auth = self.auth.select(url)
+            headers = await self._get_headers_async(type, user, auth)
+            validator_key, stored, headers = self._conditional(method, url, params, type, headers)
+
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.reserve(self._rate_key(auth), url)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            try:
+                result = await session.request(method,
+                                                url,
+                                                headers=headers,
+                                                data=self._encode(body),
+                                                proxy=self._get_proxy(url),
+                                                params=params)
+                release = True
+                try:
+                    self.auth.report(auth, result.status)
+                    if result.status < 400:
+                        if result.status == 304 and stored is not None:
+                            response = stored['body']
+                            self._refresh_validators(validator_key, stored, result.headers)
+                        elif stream:
+                            release = False
+                            return result
+                        else:
+                            data = await result.read()
+                            if result.status in (202, 204) or not data:
+                                return result
+                            response = self._decode(data, url)
+                            self._store_validators(validator_key, result.headers, response)
+                        if key is not None:
+                            self.cache.set(key, response, self.cache.ttl_for(url))
+                        return response
+                    error = self._http_error(result.status, url, await result.text(), result.headers, auth)
+                finally:
+                    if release:
+                        result.release()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = AppleMusicRequestException(str(e) or e.__class__.__name__)
+
+            delay = self.retry.next_delay(method, error, attempt, deadline)
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+            attempt = attempt + 1
+
+    def _headers_ready(self, type, user, auth):
+        """
+        Tells whether headers can be built without generating tokens or loading users,
+        which may block
+        """
+        if not auth.catalog_headers_ready():
+            return False
+        if type != ResourceType.LIBRARY:
+            return True
+        if user is None:
+            return self.auth.get_user_token() is not None
+        return self.users is None or self.users.loader is None or user in self.users
+
+    async def _get_headers_async(self, type, user, auth):
+        if self._headers_ready(type, user, auth):
+            return self._get_headers(type, user, auth)
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self._get_headers, type, user, auth)
+
+    async def _fetch_ids(self, url, params, type, ids, kind, user = None):
+        ids, chunks = self._chunk_ids(ids, kind)
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def fetch(chunk):
+            async with semaphore:
+                return await self.__call__('GET', url, {**(params or {}), 'ids': ','.join(chunk)}, type, user=user)
+
+        responses = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+        return self._merge_ids(ids, responses)
+
+    async def pages(self, endpoint, *args, page_size = None, workers = None, **kwargs):
+        request = self._prepare(endpoint, *args, **kwargs)
+        url = request.url
+        params = dict(request.params or {})
+
+        if page_size is not None:
+            params['limit'] = page_size
+
+        while url is not None:
+            page = await self.__call__(request.method, url, params, request.type, user=request.user)
+            if not isinstance(page, dict) or not page:
+                return
+            yield page
+
+            offsets = self._page_offsets(page, params) if workers is not None and workers > 1 else None
+            if offsets is not None:
+                limit = params.get('limit') or len(page.get('data', []))
+                pending = deque()
+                try:
+                    for offset in offsets:
+                        pending.append(asyncio.ensure_future(
+                            self.__call__(request.method, url, {**params, 'limit': limit, 'offset': offset}, request.type, user=request.user)
+                        ))
+                        if len(pending) >= workers:
+                            page = await pending.popleft()
+                            if not isinstance(page, dict) or not page:
+                                return
+                            yield page
+                    while pending:
+                        page = await pending.popleft()
+                        if not isinstance(page, dict) or not page:
+                            return
+                        yield page
+                finally:
+                    for task in pending:
+                        task.cancel()
+                return
+
+            url, params = self._next_page(page, params)
+
+    async def paginate(self, endpoint, *args, page_size = None, max_items = None, workers = None, **kwargs):
+        if max_items is not None and max_items <= 0:
+            return
+
+        count = 0
+        async for page in self.pages(endpoint, *args, page_size=page_size, workers=workers, **kwargs):
+            for resource in page.get('data', []):
+                yield resource
+                count = count + 1
+                if max_items is not None and count >= max_items:
+                    return
+
+    async def stream(self, endpoint, *args, page_size = None, max_items = None, chunk_size = 64 * 1024, **kwargs):
+        if max_items is not None and max_items <= 0:
+            return
+
+        request = self._prepare(endpoint, *args, **kwargs)
+        url = request.url
+        params = dict(request.params or {})
+
+        if page_size is not None:
+            params['limit'] = page_size
+
+        count = 0
+        while url is not None:
+            result = await self.__call__(request.method, url, params, request.type, user=request.user, stream=True)
+            if isinstance(result, dict):
+                document = result
+                for resource in result.get('data', []):
+                    yield resource
+                    count = count + 1
+                    if max_items is not None and count >= max_items:
+                        return
+            elif result.status in (202, 204):
+                return
+            else:
+                parser = DataParser()
+                document = parser.document
+                try:
+                    async for chunk in result.content.iter_chunked(chunk_size):
+                        for resource in parser.feed(chunk):
+                            yield resource
+                            count = count + 1
+                            if max_items is not None and count >= max_items:
+                                return
+                    for resource in parser.close():
+                        yield resource
+                        count = count + 1
+                        if max_items is not None and count >= max_items:
+                            return
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    raise AppleMusicRequestException(str(e) or e.__class__.__name__)
+                finally:
+                    result.release()
+
+            url, params = self._next_page(document, params)
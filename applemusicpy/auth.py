@@ -1,11 +1,59 @@
 from abc import ABCMeta, abstractmethod
 from calendar import c
 import jwt
+import threading
+import time
+import zlib
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from http.server import HTTPServer, BaseHTTPRequestHandler
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
 import webbrowser
 
 from applemusicpy.exceptions import AppleMusicAuthException
+from .store import TokenStoreBase
+
+AUTHORIZATION_PAGE = \
+"""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset=utf-8>
+    <link rel="shortcut icon" href="#" />
+    <title>applemusicpy authorization</title>
+</head>
+<body>
+    <p>Authorization</p>
+    <button onclick="authorize()">Click to authorize</button>
+    <script src="https://js-cdn.music.apple.com/musickit/v1/musickit.js"></script>
+    <script>
+
+        function authorize() {{
+
+            devtoken = '{token}';
+            const music = MusicKit.configure({{
+                developerToken: devtoken,
+                app: {{
+                    name: 'applemusicpy',
+                    build: '1.0.0'
+                }}
+            }});
+
+            music.authorize().then(musicUserToken => {{
+                const response = fetch('{endpoint}',{{
+                    method: 'POST',
+                    headers: {{
+                        'Content-Type': 'text/html'
+                    }},
+                    body: musicUserToken
+                }});
+            }});
+        }}
+
+    </script>
+</body>
+</html>
+"""
 
 class RequestHandler(BaseHTTPRequestHandler):
 
@@ -50,9 +98,90 @@ class AuthBase(metaclass = ABCMeta):
     def is_token_expired(self):
         pass
 
+    def get_catalog_headers(self):
+        """
+        Returns headers authorizing catalog requests, regenerating developer token when needed.
+        Returned dict must not be modified
+        """
+        if self.get_developer_token() is None or self.is_token_expired():
+            self.generate_developer_token()
+
+        return {'Authorization': 'Bearer {}'.format(self.get_developer_token())}
+
+    def catalog_headers_ready(self):
+        """
+        Tells whether get_catalog_headers() can return without generating a token
+        """
+        return self.get_developer_token() is not None and not self.is_token_expired()
+
+    def select(self, url):
+        """
+        Returns auth object that should sign request to `url`
+        """
+        return self
+
+    def report(self, auth, status):
+        """
+        Called with response status of every request signed by `auth`
+        """
+        pass
+
+class UserPool:
+    """
+    UserPool maps user ids to their Music-User-Tokens, keeping at most `max_size`
+    most recently used ones. On a miss `loader(user)` is asked for the token,
+    e.g. to read it from a database.
+    """
+    def __init__(self, max_size = 10000, loader = None):
+        self.max_size = max_size
+        self.loader = loader
+        self._tokens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, user, token):
+        with self._lock:
+            self._tokens[user] = token
+            self._tokens.move_to_end(user)
+            while len(self._tokens) > self.max_size:
+                self._tokens.popitem(last=False)
+
+    def get(self, user):
+        with self._lock:
+            token = self._tokens.get(user)
+            if token is not None:
+                self._tokens.move_to_end(user)
+                return token
+
+        if self.loader is None:
+            return None
+
+        token = self.loader(user)
+        if token is not None:
+            self.add(user, token)
+        return token
+
+    def remove(self, user):
+        with self._lock:
+            self._tokens.pop(user, None)
+
+    def __contains__(self, user):
+        return user in self._tokens
+
+    def __len__(self):
+        return len(self._tokens)
+
 class Auth(AuthBase):
     """
     Auth class provides methods that enables authentication
+
+    The private key is parsed once and developer token is re-signed by the first
+    request within `refresh_skew` seconds (at most half of `session_length`) of
+    expiry. With `background_refresh` it is re-signed in a background thread instead,
+    so requests read prebuilt headers without signing or locking; close() the Auth,
+    or use it as a context manager, to stop that thread.
+
+    With `token_store`, still valid developer and user tokens are loaded on
+    construction and every newly generated token is saved to the store.
     """
     def __init__(self,
                 secret_key=None,
@@ -60,7 +189,10 @@ class Auth(AuthBase):
                 team_id=None,
                 session_length=24,
                 address = '127.0.0.1',
-                port = 8000
+                port = 8000,
+                refresh_skew = 600,
+                background_refresh = False,
+                token_store: TokenStoreBase = None
                 ):
         
         self.secret_key = secret_key
@@ -72,9 +204,60 @@ class Auth(AuthBase):
         self.exp = None
         self.address = address
         self.port = port
+        self.refresh_skew = refresh_skew
+        self.background_refresh = background_refresh
+        self._lock = threading.RLock()
+        self._user_lock = threading.Lock()
+        self._signing_key = None
+        self._catalog_headers = None
+        self._refresh_timer = None
+        self.token_store = token_store
+
+        if token_store is not None:
+            self._load_tokens()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.stop_refresh()
+
+    def _store_name(self, kind):
+        return f'{kind}-{self.team_id}-{self.key_id}'
+
+    def _load_tokens(self):
+        developer = self.token_store.load(self._store_name('developer'))
+        if developer is not None:
+            exp = datetime.fromtimestamp(developer['exp'])
+            if datetime.now() + timedelta(seconds=self._skew()) < exp:
+                self.developer_token = developer['token']
+                self.exp = exp
+                self._catalog_headers = {'Authorization': 'Bearer {}'.format(self.developer_token)}
+                self._schedule_refresh()
+
+        user = self.token_store.load(self._store_name('user'))
+        if user is not None:
+            self.user_token = user['token']
 
     def generate_developer_token(self):
-        self.exp = datetime.now() + timedelta(hours=self.session_length)
+        with self._lock:
+            return self._generate_developer_token()
+
+    def _get_signing_key(self):
+        if self._signing_key is None:
+            secret_key = self.secret_key
+            if isinstance(secret_key, str):
+                secret_key = secret_key.encode('UTF-8')
+            if isinstance(secret_key, bytes):
+                secret_key = load_pem_private_key(secret_key, password=None)
+            self._signing_key = secret_key
+        return self._signing_key
+
+    def _generate_developer_token(self):
+        exp = datetime.now() + timedelta(hours=self.session_length)
 
         headers = {
             'alg': 'ES256',
@@ -84,57 +267,80 @@ class Auth(AuthBase):
         payload = {
             'iss': self.team_id,
             'iat': int(datetime.now().timestamp()),
-            'exp': int(self.exp.timestamp())
+            'exp': int(exp.timestamp())
         }
 
-        self.developer_token = jwt.encode(payload, self.secret_key, algorithm='ES256', headers=headers)
+        self.developer_token = jwt.encode(payload, self._get_signing_key(), algorithm='ES256', headers=headers)
+        self.exp = exp
+        self._catalog_headers = {'Authorization': 'Bearer {}'.format(self.developer_token)}
+        self._schedule_refresh()
+
+        if self.token_store is not None:
+            self.token_store.save(self._store_name('developer'), {'token': self.developer_token, 'exp': exp.timestamp()})
         return self.developer_token
 
-    def generate_user_token(self):
-        if self.developer_token is None or self.is_token_expired():
+    def _schedule_refresh(self, delay = None):
+        if not self.background_refresh:
+            return
+
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+
+        if delay is None:
+            delay = max(0, (self.exp - datetime.now()).total_seconds() - self._skew())
+        self._refresh_timer = threading.Timer(delay, self._background_refresh)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _background_refresh(self):
+        try:
             self.generate_developer_token()
+        except Exception:
+            # Requests fall back to regenerating the token themselves, try again later
+            self._schedule_refresh(min(60, self._skew()))
 
-        source = \
-        """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset=utf-8>
-            <link rel="shortcut icon" href="#" />
-            <title>applemusicpy authorization</title>
-        </head>
-        <body>
-            <p>Authorization</p>
-            <button onclick="authorize()">Click to authorize</button>
-            <script src="https://js-cdn.music.apple.com/musickit/v1/musickit.js"></script>
-            <script> 
-
-                function authorize() {{
-
-                    devtoken = '{token}';
-                    const music = MusicKit.configure({{
-                        developerToken: devtoken,
-                        app: {{
-                            name: 'applemusicpy',
-                            build: '1.0.0'
-                        }}
-                    }});
-
-                    music.authorize().then(musicUserToken => {{
-                        const response = fetch('{endpoint}',{{
-                            method: 'POST',
-                            headers: {{
-                                'Content-Type': 'text/html'
-                            }},
-                            body: musicUserToken
-                        }});
-                    }});
-                }}
+    def stop_refresh(self):
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
 
-            </script>
-        </body>
-        </html>
+    def needs_refresh(self):
+        if self.exp is None:
+            return False
+        return datetime.now() + timedelta(seconds=self._skew()) >= self.exp
+
+    def _skew(self):
+        # A skew as long as the token lifetime would re-sign the token all the time
+        return min(self.refresh_skew, self.session_length * 3600 / 2)
+
+    def catalog_headers_ready(self):
+        return self._catalog_headers is not None and not self.needs_refresh()
+
+    def get_catalog_headers(self):
+        headers = self._catalog_headers
+        if headers is None or self.needs_refresh():
+            with self._lock:
+                if self._catalog_headers is None or self.needs_refresh():
+                    self._generate_developer_token()
+                headers = self._catalog_headers
+        return headers
+
+    def generate_user_token(self):
+        # The browser flow lasts as long as the user takes, so it must not hold
+        # self._lock, which refreshes and header reads need
+        with self._user_lock:
+            token = self._request_user_token()
+            with self._lock:
+                self.user_token = token
+            if self.token_store is not None:
+                self.token_store.save(self._store_name('user'), {'token': token})
+
+    def _request_user_token(self):
         """
+        Runs the browser authorization flow and returns the Music-User-Token
+        """
+        self.get_catalog_headers()
+        source = AUTHORIZATION_PAGE
 
         auth_url = 'http://' + self.address + ':' + str(self.port)
         server = self._start_http_server(RequestHandler, source, auth_url + '/token')
@@ -151,10 +357,9 @@ class Auth(AuthBase):
         if server.get_count == 2:
             server.handle_request() # Some browsers might load page twice
 
-        if server.user_token:
-            self.user_token = server.user_token
-        else:
+        if not server.user_token:
             raise AppleMusicAuthException("Cannot retrieve user token")
+        return server.user_token
 
     def get_developer_token(self):
         return self.developer_token
@@ -179,3 +384,121 @@ class Auth(AuthBase):
         server.get_count = 0
 
         return server
+
+
+class ShardedAuth(AuthBase):
+    """
+    ShardedAuth spreads requests across several developer keys, each given as an AuthBase:
+
+        auth = ShardedAuth([Auth(secret_key=a, key_id='A', team_id=team),
+                            Auth(secret_key=b, key_id='B', team_id=team)],
+                            strategy=ShardedAuth.LEAST_THROTTLED)
+
+    Strategies pick a key per request by turns (ROUND_ROBIN), by fewest 429 responses
+    within last `window` seconds (LEAST_THROTTLED) or by hash of the storefront in
+    request url (STOREFRONT). A key answered with 429 is skipped for `eviction` seconds
+    unless every key is evicted. User tokens come from the first key.
+    """
+
+    ROUND_ROBIN = 'round_robin'
+    LEAST_THROTTLED = 'least_throttled'
+    STOREFRONT = 'storefront'
+
+    def __init__(self, auths, strategy = ROUND_ROBIN, eviction = 30, window = 60):
+        if not auths:
+            raise AppleMusicAuthException("ShardedAuth needs at least one auth")
+
+        self.auths = list(auths)
+        self.strategy = strategy
+        self.eviction = eviction
+        self.window = window
+        self._lock = threading.Lock()
+        self._turn = 0
+        self._evicted_until = [0.0] * len(self.auths)
+        self._throttles = [[] for _ in self.auths]
+        self._requests = [0] * len(self.auths)
+
+    @property
+    def primary(self):
+        return self.auths[0]
+
+    def generate_developer_token(self):
+        for auth in self.auths:
+            auth.generate_developer_token()
+        return self.primary.get_developer_token()
+
+    def generate_user_token(self):
+        return self.primary.generate_user_token()
+
+    def get_developer_token(self):
+        return self.primary.get_developer_token()
+
+    def get_user_token(self):
+        return self.primary.get_user_token()
+
+    def is_token_expired(self):
+        return self.primary.is_token_expired()
+
+    def get_catalog_headers(self):
+        return self.primary.get_catalog_headers()
+
+    def catalog_headers_ready(self):
+        return self.primary.catalog_headers_ready()
+
+    def _storefront(self, url):
+        segments = url.split('/')
+        if 'catalog' in segments:
+            index = segments.index('catalog') + 1
+            if index < len(segments):
+                return segments[index]
+        return ''
+
+    def _recent_throttles(self, index, now):
+        throttles = [moment for moment in self._throttles[index] if moment > now - self.window]
+        self._throttles[index] = throttles
+        return len(throttles)
+
+    def select(self, url):
+        now = time.monotonic()
+        with self._lock:
+            healthy = [index for index, until in enumerate(self._evicted_until) if until <= now]
+            if not healthy:
+                healthy = [min(range(len(self.auths)), key=lambda index: self._evicted_until[index])]
+
+            if self.strategy == self.STOREFRONT:
+                index = healthy[zlib.crc32(self._storefront(url).encode('UTF-8')) % len(healthy)]
+            elif self.strategy == self.LEAST_THROTTLED:
+                index = min(healthy, key=lambda index: (self._recent_throttles(index, now), self._requests[index]))
+            else:
+                index = healthy[self._turn % len(healthy)]
+                self._turn = self._turn + 1
+
+            self._requests[index] = self._requests[index] + 1
+            return self.auths[index]
+
+    def report(self, auth, status):
+        if status != 429:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            for index, member in enumerate(self.auths):
+                if member is auth:
+                    self._throttles[index].append(now)
+                    self._evicted_until[index] = now + self.eviction
+
+    def stats(self):
+        """
+        Returns requests sent and 429 responses within `window` per key
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    'key_id': getattr(auth, 'key_id', None),
+                    'requests': self._requests[index],
+                    'throttled': self._recent_throttles(index, now),
+                    'evicted': self._evicted_until[index] > now
+                }
+                for index, auth in enumerate(self.auths)
+            ]
@@ -0,0 +1,209 @@
+"""
+Module implements a server running many user authorization flows at once
+"""
+
+import heapq
+import secrets
+import threading
+import time
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from applemusicpy.exceptions import AppleMusicAuthException
+from .auth import AuthBase, AUTHORIZATION_PAGE
+
+class _Flow:
+
+    def __init__(self, state, user, callback):
+        self.state = state
+        self.user = user
+        self.callback = callback
+        self.future = Future()
+
+class _AuthorizationHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def _flow(self, prefix):
+        if not self.path.startswith(prefix):
+            return None
+        return self.server.service._flow(self.path[len(prefix):])
+
+    def _respond(self, status, content_type, body):
+        body = body.encode('UTF-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        flow = self._flow('/authorize/')
+        if flow is None:
+            self._respond(404, "text/plain", "Unknown or expired authorization")
+            return
+
+        page = AUTHORIZATION_PAGE.format(token=self.server.service._developer_token(),
+                                        endpoint='/token/' + flow.state)
+        self._respond(200, "text/html", page)
+
+    def do_POST(self):
+        flow = self._flow('/token/')
+        token = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode()
+
+        if flow is None or not token:
+            self._respond(404, "application/json", '{"details": "unknown or expired authorization"}')
+            return
+
+        self.server.service._complete(flow, token)
+        self._respond(200, "application/json", '{"details": "success"}')
+
+class _AuthorizationHTTPServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def service_actions(self):
+        # Runs on the serving thread between polls for requests
+        self.service._sweep()
+
+class AuthorizationServer:
+    """
+    AuthorizationServer serves MusicKit authorization pages from a background thread,
+    so any number of users can authorize at the same time without blocking the caller.
+    Every flow has its own unguessable url and resolves its own Future:
+
+        with AuthorizationServer(auth, port=8000) as server:
+            url, token = server.authorize(user='alice', timeout=300)
+            send_to_user(url)
+            client.users.add('alice', token.result())
+
+    Tokens are also delivered to `callback(user, token)` and stored in `users` pool
+    when given. A flow not completed within `timeout` seconds fails with
+    AppleMusicAuthException, checked about every `poll_interval` seconds by the
+    serving thread. Use asyncio.wrap_future to await tokens.
+    """
+
+    def __init__(self,
+                auth: AuthBase,
+                address = '127.0.0.1',
+                port = 8000,
+                timeout = 300,
+                public_url = None,
+                users = None,
+                poll_interval = 0.5
+                ):
+        self.auth = auth
+        self.address = address
+        self.port = port
+        self.timeout = timeout
+        self.public_url = public_url
+        self.users = users
+        self.poll_interval = poll_interval
+        self._flows = {}
+        self._deadlines = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        if self._server is not None:
+            return
+
+        self._server = _AuthorizationHTTPServer((self.address, self.port), _AuthorizationHandler)
+        self._server.service = self
+        self.port = self._server.server_address[1]
+
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(self.poll_interval,),
+                                        name='applemusicpy-authorization', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+        with self._lock:
+            flows = list(self._flows.values())
+            self._flows.clear()
+            self._deadlines.clear()
+        for flow in flows:
+            self._fail(flow, AppleMusicAuthException("Authorization server stopped"))
+
+    def authorize(self, user = None, timeout = None, callback = None):
+        """
+        Starts an authorization flow and returns (url to open, Future of Music-User-Token)
+        """
+        if self._server is None:
+            self.start()
+
+        flow = _Flow(secrets.token_urlsafe(16), user, callback)
+        timeout = self.timeout if timeout is None else timeout
+
+        with self._lock:
+            self._flows[flow.state] = flow
+            if timeout is not None:
+                self._sequence = self._sequence + 1
+                heapq.heappush(self._deadlines, (time.monotonic() + timeout, self._sequence, flow))
+
+        root = self.public_url or f'http://{self.address}:{self.port}'
+        return f'{root.rstrip("/")}/authorize/{flow.state}', flow.future
+
+    def pending(self):
+        with self._lock:
+            return len(self._flows)
+
+    def _developer_token(self):
+        self.auth.get_catalog_headers()
+        return self.auth.get_developer_token()
+
+    def _flow(self, state):
+        with self._lock:
+            return self._flows.get(state)
+
+    def _pop(self, flow):
+        with self._lock:
+            return self._flows.pop(flow.state, None) is not None
+
+    def _complete(self, flow, token):
+        if not self._pop(flow):
+            return
+
+        if self.users is not None and flow.user is not None:
+            self.users.add(flow.user, token)
+        if flow.callback is not None:
+            try:
+                flow.callback(flow.user, token)
+            except Exception as e:
+                flow.future.set_exception(e)
+                return
+        flow.future.set_result(token)
+
+    def _sweep(self):
+        """
+        Fails pending flows past their deadline
+        """
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            while self._deadlines and self._deadlines[0][0] <= now:
+                flow = heapq.heappop(self._deadlines)[2]
+                if self._flows.pop(flow.state, None) is not None:
+                    expired.append(flow)
+        for flow in expired:
+            self._fail(flow, AppleMusicAuthException("Authorization timed out"))
+
+    def _fail(self, flow, error):
+        if not flow.future.done():
+            flow.future.set_exception(error)
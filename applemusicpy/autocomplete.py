@@ -0,0 +1,283 @@
+"""
+Module implements a prefix cache for the hints and suggestions autocomplete endpoints
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+from .search import tokenize
+
+# Number of results the API returns when `limit` is not given
+DEFAULT_LIMIT = 10
+
+def normalize(term):
+    return ' '.join(tokenize(term))
+
+def _matches(text, prefix):
+    text = normalize(text or '')
+    return text.startswith(prefix) or (' ' + prefix) in (' ' + text)
+
+class _Node:
+
+    __slots__ = ('children', 'entry')
+
+    def __init__(self):
+        self.children = {}
+        self.entry = None
+
+class _Entry:
+
+    __slots__ = ('expires', 'response', 'complete')
+
+    def __init__(self, expires, response, complete):
+        self.expires = expires
+        self.response = response
+        self.complete = complete
+
+def _items(kind, response):
+    results = (response or {}).get('results') or {}
+    return results.get('terms' if kind == 'hints' else 'suggestions') or []
+
+def _text(kind, item):
+    if kind == 'hints':
+        return item
+    if 'searchTerm' in item:
+        return item.get('displayTerm') or item['searchTerm']
+    return ((item.get('content') or {}).get('attributes') or {}).get('name')
+
+class _AutocompleteBase:
+
+    def __init__(self, client, ttl = 300, max_entries = 10000):
+        self.client = client
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.derived = 0
+        self.misses = 0
+        self._roots = {}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _root(self, kind, storefront, params):
+        return (kind, storefront, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items() if k != 'term')))
+
+    def _lookup(self, kind, storefront, params, prefix):
+        """
+        Returns the cached response for `prefix`, or one filtered from the cached
+        response of its longest complete ancestor, or None
+        """
+        root = self._root(kind, storefront, params)
+        now = time.monotonic()
+
+        with self._lock:
+            node = self._roots.get(root)
+            ancestor = None
+            for depth in range(len(prefix) + 1):
+                if node is None:
+                    break
+                entry = node.entry
+                if entry is not None and entry.expires > now:
+                    if depth == len(prefix):
+                        self._entries.move_to_end((root, prefix))
+                        self.hits = self.hits + 1
+                        return entry.response
+                    if entry.complete:
+                        ancestor = entry
+                if depth < len(prefix):
+                    node = node.children.get(prefix[depth])
+
+            if ancestor is None:
+                self.misses = self.misses + 1
+                return None
+            self.derived = self.derived + 1
+
+        items = [item for item in _items(kind, ancestor.response) if _matches(_text(kind, item), prefix)]
+        return {'results': {'terms' if kind == 'hints' else 'suggestions': items}}
+
+    def _store(self, kind, storefront, params, prefix, response):
+        root = self._root(kind, storefront, params)
+        limit = int((params or {}).get('limit') or DEFAULT_LIMIT)
+        entry = _Entry(time.monotonic() + self.ttl, response, len(_items(kind, response)) < limit)
+
+        with self._lock:
+            node = self._roots.setdefault(root, _Node())
+            for char in prefix:
+                node = node.children.setdefault(char, _Node())
+            node.entry = entry
+
+            self._entries[(root, prefix)] = node
+            self._entries.move_to_end((root, prefix))
+            while len(self._entries) > self.max_entries:
+                (evicted_root, evicted_prefix), _ = self._entries.popitem(last=False)
+                self._prune(evicted_root, evicted_prefix)
+
+    def _prune(self, root, prefix):
+        """
+        Drops the entry of `prefix` and trie nodes left without entries or children
+        """
+        path = [self._roots[root]]
+        for char in prefix:
+            path.append(path[-1].children[char])
+        path[-1].entry = None
+
+        for depth in range(len(prefix), 0, -1):
+            node = path[depth]
+            if node.entry is not None or node.children:
+                break
+            del path[depth - 1].children[prefix[depth - 1]]
+
+        if not path[0].children and path[0].entry is None:
+            del self._roots[root]
+
+    def _params(self, params, term):
+        params = dict(params or {})
+        params['term'] = term
+        return params
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'derived': self.derived,
+            'misses': self.misses,
+            'size': len(self._entries)
+        }
+
+class AutocompleteCache(_AutocompleteBase):
+    """
+    AutocompleteCache answers hints and suggestions requests from a trie of cached
+    responses keyed by storefront, other params and normalized term:
+
+        autocomplete = AutocompleteCache(client)
+        autocomplete.hints('tay', storefront='us')
+
+    When a prefix is not cached but a shorter one is and returned fewer results than
+    its limit, that response holds every possible completion and is filtered locally
+    instead of sending a request. Entries expire after `ttl` seconds and at most
+    `max_entries` are kept, evicting least recently used ones. See session() for
+    debouncing a user's keystrokes.
+    """
+
+    def hints(self, term, storefront = 'en', params = None):
+        return self._get('hints', term, storefront, params)
+
+    def suggestions(self, term, storefront = 'en', params = None):
+        return self._get('suggestions', term, storefront, params)
+
+    def _get(self, kind, term, storefront, params):
+        response = self._lookup(kind, storefront, params, normalize(term))
+        if response is None:
+            response = self._request(kind, term, storefront, params)
+        return response
+
+    def _request(self, kind, term, storefront, params):
+        response = getattr(self.client, kind)(storefront, self._params(params, term))
+        self._store(kind, storefront, params, normalize(term), response)
+        return response
+
+    def session(self, debounce = 0.15):
+        return AutocompleteSession(self, debounce)
+
+class AutocompleteSession:
+    """
+    AutocompleteSession serves one user's keystrokes. Uncached terms wait `debounce`
+    seconds first, and a call superseded by a newer one of the session returns
+    None instead of a stale response, without a request if it was still waiting.
+    """
+
+    def __init__(self, cache, debounce = 0.15):
+        self.cache = cache
+        self.debounce = debounce
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _next(self):
+        with self._lock:
+            self._generation = self._generation + 1
+            return self._generation
+
+    def _current(self, generation):
+        return generation == self._generation
+
+    def hints(self, term, storefront = 'en', params = None):
+        return self._get('hints', term, storefront, params)
+
+    def suggestions(self, term, storefront = 'en', params = None):
+        return self._get('suggestions', term, storefront, params)
+
+    def _get(self, kind, term, storefront, params):
+        generation = self._next()
+        response = self.cache._lookup(kind, storefront, params, normalize(term))
+        if response is not None:
+            return response
+
+        time.sleep(self.debounce)
+        if not self._current(generation):
+            return None
+
+        response = self.cache._request(kind, term, storefront, params)
+        return response if self._current(generation) else None
+
+class AsyncAutocompleteCache(_AutocompleteBase):
+    """
+    AsyncAutocompleteCache is AutocompleteCache for AsyncClient
+    """
+
+    async def hints(self, term, storefront = 'en', params = None):
+        return await self._get('hints', term, storefront, params)
+
+    async def suggestions(self, term, storefront = 'en', params = None):
+        return await self._get('suggestions', term, storefront, params)
+
+    async def _get(self, kind, term, storefront, params):
+        response = self._lookup(kind, storefront, params, normalize(term))
+        if response is None:
+            response = await self._request(kind, term, storefront, params)
+        return response
+
+    async def _request(self, kind, term, storefront, params):
+        response = await getattr(self.client, kind)(storefront, self._params(params, term))
+        self._store(kind, storefront, params, normalize(term), response)
+        return response
+
+    def session(self, debounce = 0.15):
+        return AsyncAutocompleteSession(self, debounce)
+
+class AsyncAutocompleteSession:
+    """
+    AsyncAutocompleteSession is AutocompleteSession for AsyncClient. A newer call
+    cancels the superseded one, including its request if already sent.
+    """
+
+    def __init__(self, cache, debounce = 0.15):
+        self.cache = cache
+        self.debounce = debounce
+        self._task = None
+
+    async def hints(self, term, storefront = 'en', params = None):
+        return await self._get('hints', term, storefront, params)
+
+    async def suggestions(self, term, storefront = 'en', params = None):
+        return await self._get('suggestions', term, storefront, params)
+
+    async def _fetch(self, kind, term, storefront, params):
+        await asyncio.sleep(self.debounce)
+        return await self.cache._request(kind, term, storefront, params)
+
+    async def _get(self, kind, term, storefront, params):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        response = self.cache._lookup(kind, storefront, params, normalize(term))
+        if response is not None:
+            return response
+
+        task = self._task = asyncio.ensure_future(self._fetch(kind, term, storefront, params))
+        await asyncio.wait((task,))
+        if self._task is task:
+            self._task = None
+        if task.cancelled():
+            return None
+        return task.result()
@@ -0,0 +1,263 @@
+"""
+Module implements response caches used by Client
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+class CacheBase(metaclass = ABCMeta):
+    """
+    CacheBase is useful when one wants to implement custom cache backend.
+    Keys are strings of form 'METHOD url?sorted-params', values are decoded responses.
+
+    `ttl` is the default lifetime in seconds, `ttls` overrides it per catalog
+    resource kind, e.g. {'charts': 300, 'genres': 86400}
+    """
+
+    def __init__(self, ttl = 300, ttls = None):
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    def get(self, key):
+        pass
+
+    @abstractmethod
+    def set(self, key, value, ttl = None):
+        pass
+
+    @abstractmethod
+    def invalidate(self, url = None):
+        """
+        Removes entries of `url` and of urls below it, or all entries if `url` is None
+        """
+        pass
+
+    @staticmethod
+    def _under(entry_url, url):
+        """
+        Tells whether `entry_url` is `url` itself, a path below it or it with a query
+        """
+        return entry_url == url or entry_url.startswith(url + '/') or entry_url.startswith(url + '?')
+
+    def ttl_for(self, url):
+        """
+        Returns lifetime of a response from `url` based on its catalog resource kind,
+        e.g. 'albums' for .../catalog/us/albums/123
+        """
+        segments = [segment for segment in urlsplit(url).path.split('/') if segment]
+        if 'catalog' in segments:
+            index = segments.index('catalog') + 2
+            if index < len(segments):
+                return self.ttls.get(segments[index], self.ttl)
+        return self.ttl
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+class MemoryCache(CacheBase):
+    """
+    MemoryCache keeps at most `max_size` responses in process memory,
+    evicting least recently used ones. Cached responses are shared
+    between callers and should be treated as read-only.
+    """
+
+    def __init__(self, max_size = 1024, ttl = 300, ttls = None):
+        super().__init__(ttl, ttls)
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses = self.misses + 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits = self.hits + 1
+            return entry[1]
+
+    def set(self, key, value, ttl = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions = self.evictions + 1
+
+    def invalidate(self, url = None):
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+                return
+
+            for key in [key for key in self._entries if self._under(key.split(' ', 1)[1], url)]:
+                del self._entries[key]
+
+    def stats(self):
+        stats = super().stats()
+        stats['size'] = len(self._entries)
+        return stats
+
+class SQLiteCache(CacheBase):
+    """
+    SQLiteCache stores zlib-compressed responses in a SQLite file, so it can be shared
+    by several processes on one host and survives restarts. Once compressed bodies
+    exceed `max_bytes`, least recently used entries are evicted.
+    """
+
+    ACCESS_RESOLUTION = 60
+
+    def __init__(self, path, max_bytes = 256 * 1024 * 1024, ttl = 300, ttls = None, timeout = 30):
+        super().__init__(ttl, ttls)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, url TEXT NOT NULL, expires REAL, '
+                'accessed REAL NOT NULL, size INTEGER NOT NULL, body BLOB NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+            # Running total of body sizes, so writes don't sum the whole table
+            connection.execute('CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL)')
+            connection.execute('INSERT OR IGNORE INTO totals (id, size) SELECT 0, COALESCE(SUM(size), 0) FROM responses')
+            connection.execute(
+                'CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses '
+                'BEGIN UPDATE totals SET size = size + new.size WHERE id = 0; END'
+            )
+            connection.execute(
+                'CREATE TRIGGER IF NOT EXISTS responses_update AFTER UPDATE OF size ON responses '
+                'BEGIN UPDATE totals SET size = size - old.size + new.size WHERE id = 0; END'
+            )
+            connection.execute(
+                'CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses '
+                'BEGIN UPDATE totals SET size = size - old.size WHERE id = 0; END'
+            )
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _connection(self):
+        return _Transaction(self._connect())
+
+    def get(self, key):
+        now = time.time()
+        row = self._connect().execute('SELECT expires, accessed, body FROM responses WHERE key = ?', (key,)).fetchone()
+
+        if row is not None and row[0] is not None and row[0] < now:
+            with self._connection() as connection:
+                connection.execute('DELETE FROM responses WHERE key = ? AND expires < ?', (key, now))
+            row = None
+
+        if row is None:
+            self.misses = self.misses + 1
+            return None
+
+        # Recency only needs to be approximate, so avoid a write on every hit
+        if now - row[1] > self.ACCESS_RESOLUTION:
+            with self._connection() as connection:
+                connection.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+
+        self.hits = self.hits + 1
+        return json.loads(zlib.decompress(row[2]))
+
+    def set(self, key, value, ttl = None):
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        body = zlib.compress(json.dumps(value, separators=(',', ':')).encode('UTF-8'))
+
+        with self._connection() as connection:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete skips triggers
+            connection.execute(
+                'INSERT INTO responses (key, url, expires, accessed, size, body) VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET url = excluded.url, expires = excluded.expires, '
+                'accessed = excluded.accessed, size = excluded.size, body = excluded.body',
+                (key, key.split(' ', 1)[1], now + ttl if ttl is not None else None, now, len(body), body)
+            )
+            if self._total(connection) > self.max_bytes:
+                self._evict(connection, now)
+
+    def _total(self, connection):
+        return connection.execute('SELECT size FROM totals WHERE id = 0').fetchone()[0]
+
+    def _evict(self, connection, now):
+        self.evictions = self.evictions + connection.execute('DELETE FROM responses WHERE expires < ?', (now,)).rowcount
+
+        excess = self._total(connection) - self.max_bytes
+        evicted = []
+        for key, size in connection.execute('SELECT key, size FROM responses ORDER BY accessed'):
+            if excess <= 0:
+                break
+            evicted.append((key,))
+            excess = excess - size
+
+        connection.executemany('DELETE FROM responses WHERE key = ?', evicted)
+        self.evictions = self.evictions + len(evicted)
+
+    def invalidate(self, url = None):
+        with self._connection() as connection:
+            if url is None:
+                connection.execute('DELETE FROM responses')
+            else:
+                connection.execute(
+                    'DELETE FROM responses WHERE url = ? OR substr(url, 1, ?) IN (?, ?)',
+                    (url, len(url) + 1, url + '/', url + '?')
+                )
+
+    def stats(self):
+        stats = super().stats()
+        stats['size'], stats['bytes'] = self._connect().execute(
+            'SELECT (SELECT COUNT(*) FROM responses), size FROM totals WHERE id = 0'
+        ).fetchone()
+        return stats
+
+class _Transaction:
+    """
+    Runs statements of a `with` block in one immediate transaction,
+    serializing writers of different processes
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute('BEGIN IMMEDIATE')
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.connection.execute('ROLLBACK' if exc_type else 'COMMIT')
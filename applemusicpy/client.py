@@ -1,21 +1,86 @@
+import hashlib
 import json
-from urllib.parse import urljoin
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
 import requests
-from requests.models import HTTPError
+from requests.adapters import HTTPAdapter
 
-from applemusicpy.exceptions import ResourceTypeException
+from applemusicpy.exceptions import AppleMusicClientException, ResourceTypeException, AppleMusicAuthException, AppleMusicHTTPException, AppleMusicRateLimitException, AppleMusicRequestException
 from .auth import AuthBase
 from .auth import Auth
+from .auth import UserPool
+from .cache import CacheBase
+from .codec import CodecBase, default_codec
+from .retry import RetryPolicy
+from .ratelimit import RateLimiter
+from .stream import DataParser
 from .types import *
 
 class ResourceType:
     CATALOG = 0
     LIBRARY = 1
 
+# Maximum number of ids accepted by a single multi-resource request
+MAX_IDS = {
+    'albums': 100,
+    'artists': 25,
+    'music-videos': 100,
+    'playlists': 25,
+    'songs': 300,
+    'stations': 100
+}
+
+# Seconds validators are kept since a response last confirmed them
+VALIDATOR_TTL = 30 * 24 * 3600
+
+class _Request:
+    """
+    Stand-in passed as `self` to an endpoint method to record the request
+    it would issue instead of sending it
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self.method = None
+        self.url = None
+        self.params = None
+        self.type = None
+        self.body = None
+        self.user = None
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def __call__(self, method, url, params, type = ResourceType.CATALOG, body = None, user = None):
+        self.method = method
+        self.url = url
+        self.params = params
+        self.type = type
+        self.body = body
+        self.user = user
+        return self
+
 class Client:
     """
     Client class implements all endpoints described here:
     https://developer.apple.com/documentation/applemusicapi/
+
+    Client is safe to share between threads. Its session keeps up to `pool_maxsize`
+    connections per host alive, so set it to at least the number of threads using it.
+
+    Library endpoints accept `user`, so one client (one session, one developer token)
+    can serve many users:
+
+        client = Client(auth=auth, users=UserPool())
+        client.users.add('alice', music_user_token)
+        client.albums(type=ResourceType.LIBRARY, user='alice')
+
+    With `single_flight=True`, identical GETs issued concurrently for the same user
+    share one request and all callers receive its response (or exception). The response
+    object is then shared between them and should be treated as read-only.
     """
 
     def __init__(self,
@@ -24,7 +89,20 @@ class Client:
                 requests_session=True,
                 max_retries=10, 
                 requests_timeout=None,
-                raw_json=False
+                raw_json=False,
+                workers=8,
+                cache: CacheBase=None,
+                validators: CacheBase=None,
+                retry: RetryPolicy=None,
+                rate_limiter: RateLimiter=None,
+                pool_connections=10,
+                pool_maxsize=10,
+                pool_block=False,
+                keep_alive=True,
+                users: UserPool=None,
+                codec: CodecBase=None,
+                single_flight=False,
+                validator_ttl=VALIDATOR_TTL
                 ):
         self.auth = auth
         self.proxies = proxies
@@ -32,62 +110,498 @@ class Client:
         self.max_retries = max_retries
         self.requests_timeout = requests_timeout
         self.raw_json = raw_json
+        self.workers = workers
+        self.cache = cache
+        self.validators = validators
+        self.validator_ttl = validator_ttl
+        self.retry = retry if retry is not None else RetryPolicy(max_retries=max_retries)
+        self.rate_limiter = rate_limiter
+        self.users = users
+        self.codec = codec if codec is not None else default_codec()
+        self.single_flight = single_flight
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self.max_ids = dict(MAX_IDS)
         self.url_root = 'https://api.music.apple.com/v1/'
+        self._auth_lock = threading.RLock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
 
         if requests_session:
             self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections,
+                                    pool_maxsize=pool_maxsize,
+                                    pool_block=pool_block)
+            self._session.mount('https://', adapter)
+            self._session.mount('http://', adapter)
+            if not keep_alive:
+                self._session.headers['Connection'] = 'close'
         else:
             self._session = requests.api
 
-    def _get_catalog_headers(self):
-        if self.auth.get_developer_token() is None:
-            self.auth.generate_developer_token()
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        if self.request_session:
+            self._session.close()
+
+    def _get_catalog_headers(self, auth = None):
+        return dict((auth or self.auth).get_catalog_headers())
+
+    def _get_user_token(self, user):
+        """
+        Resolves per-call user context: a user id looked up in `users` pool,
+        or the Music-User-Token itself when the client has no pool
+        """
+        if self.users is None:
+            return user
+
+        token = self.users.get(user)
+        if token is None:
+            raise AppleMusicAuthException(f"No Music-User-Token for user {user}")
+        return token
+
+    def _get_library_headers(self, user = None, auth = None):
+        if user is not None:
+            token = self._get_user_token(user)
+        else:
+            if self.auth.get_user_token() is None:
+                with self._auth_lock:
+                    if self.auth.get_user_token() is None:
+                        self.auth.generate_user_token()
+            token = self.auth.get_user_token()
 
-        return {'Authorization': 'Bearer {}'.format(self.auth.get_developer_token())}
+        headers = self._get_catalog_headers(auth)
+        headers['Music-User-Token'] = '{}'.format(token)
+        return headers
 
-    def _get_library_headers(self):
-        if self.auth.get_developer_token() is None or self.auth.is_token_expired():
-            self.auth.generate_developer_token()
-            self.auth.generate_user_token()
-        
-        if self.auth.get_user_token() is None:
-            self.auth.generate_user_token()
-
-        return {
-            'Music-User-Token': '{}'.format(self.auth.get_user_token()),
-            'Authorization': 'Bearer {}'.format(self.auth.get_developer_token())
-        }
-
-    def __call__(self, method, url, params, type = ResourceType.CATALOG, body = None):
+    def _get_headers(self, type, user = None, auth = None):
         if type == ResourceType.CATALOG:
-            headers = self._get_catalog_headers()
+            headers = self._get_catalog_headers(auth)
         elif type == ResourceType.LIBRARY:
-            headers = self._get_library_headers()
+            headers = self._get_library_headers(user, auth)
         else:
-            print('ERROR')
+            raise ResourceTypeException()
 
         headers['Content-Type'] = 'application/json'
-
-        retries = 0
-        while retries < self.max_retries:
+        return headers
+
+    def _cache_key(self, method, url, params):
+        url = url.rstrip('/')
+        if params:
+            url = url + '?' + urlencode(sorted((str(k), str(v)) for k, v in params.items()))
+        return method + ' ' + url
+
+    def _cached(self, method, url, params, type):
+        """
+        Returns (key, response) for a cacheable request, response being None on a miss.
+        Only catalog GETs are cacheable, so library responses never leak between users.
+        """
+        if self.cache is None or method != 'GET' or type != ResourceType.CATALOG:
+            return None, None
+
+        key = self._cache_key(method, url, params)
+        return key, self.cache.get(key)
+
+    def _scope(self, headers):
+        """
+        Identifies whose data a response is, so user-specific responses are stored per user
+        """
+        token = headers.get('Music-User-Token')
+        if token is None:
+            return ''
+        return ' ' + hashlib.sha256(token.encode('UTF-8')).hexdigest()[:16]
+
+    def _conditional(self, method, url, params, type, headers):
+        """
+        Returns (key, stored validators, headers) adding If-None-Match / If-Modified-Since
+        when validators of a previous response to the same GET are known
+        """
+        if self.validators is None or method != 'GET':
+            return None, None, headers
+
+        key = self._cache_key(method, url, params) + self._scope(headers)
+        stored = self.validators.get(key)
+        if stored is None:
+            return key, None, headers
+
+        headers = dict(headers)
+        if stored.get('etag'):
+            headers['If-None-Match'] = stored['etag']
+        if stored.get('last_modified'):
+            headers['If-Modified-Since'] = stored['last_modified']
+        return key, stored, headers
+
+    def _store_validators(self, key, response_headers, response):
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if key is not None and (etag or last_modified):
+            self.validators.set(key, {'etag': etag, 'last_modified': last_modified, 'body': response}, self.validator_ttl)
+
+    def _refresh_validators(self, key, stored, response_headers):
+        """
+        Keeps validators confirmed by a 304 alive, taking over any new ones it sent
+        """
+        stored = dict(stored)
+        stored['etag'] = response_headers.get('ETag') or stored.get('etag')
+        stored['last_modified'] = response_headers.get('Last-Modified') or stored.get('last_modified')
+        self.validators.set(key, stored, self.validator_ttl)
+
+    def invalidate(self, endpoint = None, *args, **kwargs):
+        """
+        Drops cached responses of an endpoint call (and everything below its url),
+        or the whole cache when called without arguments:
+
+            client.invalidate(client.album, '1440857781', storefront='us')
+        """
+        if self.cache is None:
+            return
+        if endpoint is None:
+            self.cache.invalidate()
+        else:
+            self.cache.invalidate(self._prepare(endpoint, *args, **kwargs).url.rstrip('/'))
+
+    def __call__(self, method, url, params, type = ResourceType.CATALOG, body = None, user = None, stream = False):
+        key, cached = self._cached(method, url, params, type)
+        if cached is not None:
+            return cached
+
+        flight = self._flight_key(method, url, params, type, user, stream)
+        if flight is None:
+            return self._send(method, url, params, type, body, user, stream, key)
+
+        with self._inflight_lock:
+            future = self._inflight.get(flight)
+            leader = future is None
+            if leader:
+                future = self._inflight[flight] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            response = self._send(method, url, params, type, body, user, stream, key)
+        except BaseException as e:
+            self._land(flight)
+            future.set_exception(e)
+            raise
+        self._land(flight)
+        future.set_result(response)
+        return response
+
+    def _flight_key(self, method, url, params, type, user, stream):
+        """
+        Identifies concurrent requests that can share one response: GETs of the same
+        url and params for the same user. Returns None for requests that cannot.
+        """
+        if not self.single_flight or method != 'GET' or stream:
+            return None
+        return (self._cache_key(method, url, params), type, user)
+
+    def _land(self, flight):
+        with self._inflight_lock:
+            self._inflight.pop(flight, None)
+
+    def _send(self, method, url, params, type, body, user, stream, key):
+        deadline = self.retry.start()
+        attempt = 0
+        while True:
+            auth = self.auth.select(url)
+            headers = self._get_headers(type, user, auth)
+            validator_key, stored, headers = self._conditional(method, url, params, type, headers)
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(self._rate_key(auth), url)
             try:
                 result = self._session.request(method, 
                                                 url, 
                                                 headers=headers,
-                                                json=body,
+                                                data=self._encode(body),
                                                 proxies=self.proxies, 
                                                 params=params,
-                                                timeout=self.requests_timeout)
-                result.raise_for_status()
-                if result.status_code == 204:
-                    return result
-                return result.json()
-            except HTTPError as e:
-                print(e)
+                                                timeout=self.requests_timeout,
+                                                stream=stream)
+            except requests.RequestException as e:
+                error = AppleMusicRequestException(str(e))
+            else:
+                self.auth.report(auth, result.status_code)
+                if result.status_code < 400:
+                    if result.status_code == 304 and stored is not None:
+                        response = stored['body']
+                        self._refresh_validators(validator_key, stored, result.headers)
+                    elif stream or result.status_code in (202, 204) or not result.content:
+                        return result
+                    else:
+                        response = self._decode(result.content, url)
+                        self._store_validators(validator_key, result.headers, response)
+                    if key is not None:
+                        self.cache.set(key, response, self.cache.ttl_for(url))
+                    return response
+                error = self._http_error(result.status_code, url, result.text, result.headers, auth)
+
+            delay = self.retry.next_delay(method, error, attempt, deadline)
+            if delay is None:
+                raise error
+            time.sleep(delay)
+            attempt = attempt + 1
+
+    def _encode(self, body):
+        return self.codec.encode(body) if body is not None else None
+
+    def _decode(self, data, url):
+        try:
+            return self.codec.decode(data)
+        except Exception as e:
+            raise AppleMusicRequestException(f'Invalid JSON response from {url}: {e}')
+
+    def _rate_key(self, auth):
+        return getattr(auth, 'key_id', None)
+
+    def _http_error(self, status, url, body, headers, auth):
+        if status == 429:
+            retry_after = RetryPolicy.parse_retry_after(headers.get('Retry-After'))
+            if self.rate_limiter is not None:
+                self.rate_limiter.throttled(self._rate_key(auth), url, retry_after)
+            return AppleMusicRateLimitException(status, url=url, body=body, retry_after=retry_after)
+        return AppleMusicHTTPException(status, url=url, body=body)
+
+    def _prepare(self, endpoint, *args, **kwargs):
+        """
+        Returns the _Request an endpoint (bound method or method name)
+        would issue for given arguments
+        """
+        if kwargs.get('ids') is not None:
+            # Endpoints send requests by ids themselves, there is no single request to page through
+            raise AppleMusicClientException("Listing by ids can't be paged, call the endpoint directly")
+        if isinstance(endpoint, str):
+            endpoint = getattr(self, endpoint)
+        endpoint = getattr(endpoint, '__func__', endpoint)
+        return endpoint(_Request(self), *args, **kwargs)
+
+    def _next_page(self, page, params):
+        next = page.get('next') if isinstance(page, dict) else None
+        if not next:
+            return None, None
+
+        parts = urlsplit(urljoin(self.url_root, next))
+        params = dict(params)
+        params.update(parse_qsl(parts.query))
+
+        return urlunsplit(parts._replace(query='')), params
+
+    def _page_offsets(self, page, params):
+        """
+        Returns offsets of the pages remaining after `page` when the response reports `meta.total`
+        """
+        total = (page.get('meta') or {}).get('total')
+        limit = params.get('limit') or len(page.get('data', []))
+        if total is None or not limit:
+            return None
+
+        limit = int(limit)
+        return range(int(params.get('offset', 0)) + limit, int(total), limit)
+
+    def _imap(self, executor, fn, iterable, window):
+        """
+        Like executor.map, but keeps at most `window` calls pending so results are consumed lazily
+        """
+        pending = deque()
+        try:
+            for item in iterable:
+                pending.append(executor.submit(fn, item))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def pages(self, endpoint, *args, page_size = None, workers = None, **kwargs):
+        """
+        Lazily yields response pages of a list endpoint, following `next` links:
+
+            for page in client.pages(client.albums, type=ResourceType.LIBRARY):
+                ...
+
+        With `workers` > 1 and a first page reporting `meta.total`, the remaining pages
+        are requested concurrently by offset and still yielded in order.
+        """
+        request = self._prepare(endpoint, *args, **kwargs)
+        url = request.url
+        params = dict(request.params or {})
+
+        if page_size is not None:
+            params['limit'] = page_size
+
+        while url is not None:
+            page = self.__call__(request.method, url, params, request.type, user=request.user)
+            if not isinstance(page, dict) or not page:
+                return
+            yield page
+
+            offsets = self._page_offsets(page, params) if workers is not None and workers > 1 else None
+            if offsets is not None:
+                limit = params.get('limit') or len(page.get('data', []))
+                fetch = lambda offset: self.__call__(request.method, url, {**params, 'limit': limit, 'offset': offset}, request.type, user=request.user)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for page in self._imap(executor, fetch, offsets, workers * 2):
+                        if not isinstance(page, dict) or not page:
+                            return
+                        yield page
+                return
+
+            url, params = self._next_page(page, params)
+
+    def paginate(self, endpoint, *args, page_size = None, max_items = None, workers = None, **kwargs):
+        """
+        Lazily yields resources from the `data` array of every page of a list endpoint.
+        Stops after `max_items` resources if given. See pages() for `workers`.
+        """
+        if max_items is not None and max_items <= 0:
+            return
+
+        count = 0
+        for page in self.pages(endpoint, *args, page_size=page_size, workers=workers, **kwargs):
+            for resource in page.get('data', []):
+                yield resource
+                count = count + 1
+                if max_items is not None and count >= max_items:
+                    return
+
+    def stream(self, endpoint, *args, page_size = None, max_items = None, chunk_size = 64 * 1024, **kwargs):
+        """
+        Like paginate(), but every page is read in `chunk_size` chunks and its resources
+        are yielded as soon as they are parsed, so memory holds about one chunk
+        and one resource instead of a whole page
+        """
+        if max_items is not None and max_items <= 0:
+            return
+
+        request = self._prepare(endpoint, *args, **kwargs)
+        url = request.url
+        params = dict(request.params or {})
+
+        if page_size is not None:
+            params['limit'] = page_size
+
+        count = 0
+        while url is not None:
+            result = self.__call__(request.method, url, params, request.type, user=request.user, stream=True)
+            if isinstance(result, dict):
+                parser = None
+                items, document = result.get('data', []), result
+            elif result.status_code in (202, 204):
+                return
+            else:
+                parser = DataParser()
+                items, document = self._stream_items(result, parser, chunk_size), parser.document
+
+            for resource in items:
+                yield resource
+                count = count + 1
+                if max_items is not None and count >= max_items:
+                    if parser is not None:
+                        items.close()
+                    return
+
+            url, params = self._next_page(document, params)
+
+    def _stream_items(self, result, parser, chunk_size):
+        try:
+            for chunk in result.iter_content(chunk_size):
+                yield from parser.feed(chunk)
+            yield from parser.close()
+        except requests.RequestException as e:
+            raise AppleMusicRequestException(str(e))
+        finally:
+            result.close()
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='applemusicpy')
+            return self._executor
+
+    def _call(self, call):
+        """
+        Runs one entry of map(): a callable, or a tuple (endpoint, args[, kwargs])
+        with endpoint given as bound method or method name
+        """
+        if callable(call):
+            return call()
+
+        call = tuple(call)
+        endpoint = call[0]
+        args = call[1] if len(call) > 1 else ()
+        kwargs = call[2] if len(call) > 2 else {}
+        if isinstance(endpoint, str):
+            endpoint = getattr(self, endpoint)
+        return endpoint(*args, **kwargs)
+
+    def map(self, calls, workers = None, return_exceptions = False):
+        """
+        Executes endpoint calls on the client's thread pool, keeping at most `workers`
+        of them in flight, and returns their results in order:
+
+            albums = client.map((client.album, (id,), {'storefront': 'us'}) for id in ids)
+
+        With `return_exceptions` an exception raised by a call is returned in its place.
+        """
+        def run(call):
+            try:
+                return self._call(call)
             except Exception as e:
-                print(e)
-            retries = retries + 1
-    
+                if return_exceptions:
+                    return e
+                raise
+
+        window = max(1, workers or self.workers)
+        return list(self._imap(self._get_executor(), run, calls, window))
+
+    def _chunk_ids(self, ids, kind):
+        if isinstance(ids, str):
+            ids = ids.split(',')
+        ids = list(dict.fromkeys(str(id) for id in ids))
+        size = self.max_ids.get(kind, min(MAX_IDS.values()))
+        return ids, [ids[i:i + size] for i in range(0, len(ids), size)]
+
+    def _merge_ids(self, ids, responses):
+        """
+        Merges `data` of per-chunk responses in order of `ids`, reporting ids
+        that were not returned under `meta.missing`
+        """
+        found = {}
+        for response in responses:
+            if isinstance(response, dict):
+                for resource in response.get('data', []):
+                    found.setdefault(resource.get('id'), resource)
+
+        return {
+            'data': [found[id] for id in ids if id in found],
+            'meta': {'missing': [id for id in ids if id not in found]}
+        }
+
+    def _fetch_ids(self, url, params, type, ids, kind, user = None):
+        """
+        Requests resources by an arbitrary number of ids, splitting them into
+        chunks of at most `max_ids[kind]` fetched concurrently
+        """
+        ids, chunks = self._chunk_ids(ids, kind)
+        fetch = lambda chunk: self.__call__('GET', url, {**(params or {}), 'ids': ','.join(chunk)}, type, user=user)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(chunks)))) as executor:
+            responses = list(executor.map(fetch, chunks))
+
+        return self._merge_ids(ids, responses)
+
     def _join(self, components):
 
         if type(components) is not list:
@@ -104,7 +618,8 @@ class Client:
                 id, 
                 storefront = 'en', 
                 params = None, 
-                type = ResourceType.CATALOG
+                type = ResourceType.CATALOG,
+                user = None
             ):
 
         url = None
@@ -116,14 +631,15 @@ class Client:
         else:
             raise ResourceTypeException()
 
-        return self.__call__('GET', url, params, type)
+        return self.__call__('GET', url, params, type, user=user)
 
     def album_relationship(self, 
                             id, 
                             relationship, 
                             storefront = 'en', 
                             params = None, 
-                            type = ResourceType.CATALOG
+                            type = ResourceType.CATALOG,
+                            user = None
                         ):
 
         url = None
@@ -135,7 +651,7 @@ class Client:
         else:
             raise ResourceTypeException()
 
-        return self.__call__('GET', url, params, type)
+        return self.__call__('GET', url, params, type, user=user)
 
     def album_relationship_view(self, 
                                 id, 
@@ -149,7 +665,9 @@ class Client:
     def albums(self, 
                 storefront = 'en', 
                 params = None, 
-                type = ResourceType.CATALOG
+                type = ResourceType.CATALOG,
+                ids = None,
+                user = None
             ):
         
         url = None
@@ -161,17 +679,21 @@ class Client:
         else:
             raise ResourceTypeException()
         
-        return self.__call__('GET', url, params, type)
+        if ids is not None:
+            return self._fetch_ids(url, params, type, ids, 'albums', user)
+
+        return self.__call__('GET', url, params, type, user=user)
 
-    def add_resource(self, params = None):
+    def add_resource(self, params = None, user = None):
         url = self._join(f'me/library')
-        return self.__call__('POST', url, params, ResourceType.LIBRARY)
+        return self.__call__('POST', url, params, ResourceType.LIBRARY, user=user)
 
     def artist(self, 
                 id, 
                 storefront = 'en', 
                 params = None, 
-                type = ResourceType.CATALOG
+                type = ResourceType.CATALOG,
+                user = None
             ):
 
         url = None
@@ -183,31 +705,37 @@ class Client:
         else:
             raise ResourceTypeException()
         
-        return self.__call__('GET', url, params, type)
+        return self.__call__('GET', url, params, type, user=user)
 
     def artists(self, 
                 storefront = 'en', 
                 params = None, 
-                type = ResourceType.CATALOG
+                type = ResourceType.CATALOG,
+                ids = None,
+                user = None
             ):
         
         url = None
 
         if type == ResourceType.CATALOG:
-            url = self.__join(f'catalog/{storefront}/artists')
+            url = self._join(f'catalog/{storefront}/artists')
         elif type == ResourceType.LIBRARY:
             url = self._join(f'me/library/artists')
         else:
             raise ResourceTypeException()
 
-        return self.__call__('GET', url, params, type)
+        if ids is not None:
+            return self._fetch_ids(url, params, type, ids, 'artists', user)
+
+        return self.__call__('GET', url, params, type, user=user)
 
     def artist_relationship(self, 
                             id, 
                             relationship, 
                             storefront = 'en', 
                             params = None, 
-                            type = ResourceType.CATALOG
+                            type = ResourceType.CATALOG,
+                            user = None
                         ):
         url = None
 
@@ -218,7 +746,7 @@ class Client:
         else:
             raise ResourceTypeException()
 
-        return self.__call__('GET', url, params, type)
+        return self.__call__('GET', url, params, type, user=user)
 
     def artist_relationship_view(self, 
                                 id, 
@@ -234,7 +762,8 @@ class Client:
             id, 
             storefront = 'en', 
             params = None, 
-            type = ResourceType.CATALOG
+            type = ResourceType.CATALOG,
+            user = None
             ):
         
         url = None
@@ -246,13 +775,15 @@ class Client:
         else:
             raise ResourceTypeException()
 
-        return self.__call__('GET', url, params, type)
+        return self.__call__('GET', url, params, type, user=user)
 
     def songs(self, 
-                id, 
+                id = None,
                 storefront = 'en', 
                 params = None, 
-                type = ResourceType.CATALOG
+                type = ResourceType.CATALOG,
+                ids = None,
+                user = None
             ):
         
         url = None
@@ -264,14 +795,18 @@ class Client:
         else:
             raise ResourceTypeException()
 
-        return self.__call__('GET', url, params, type)
+        if ids is not None:
+            return self._fetch_ids(url, params, type, ids, 'songs', user)
+
+        return self.__call__('GET', url, params, type, user=user)
 
     def song_relationship(self, 
                             id, 
                             relationship, 
                             storefront = 'en', 
                             params = None, 
-                            type = ResourceType.CATALOG
+                            type = ResourceType.CATALOG,
+                            user = None
                         ):
 
         url = None
@@ -281,13 +816,14 @@ class Client:
         elif type == ResourceType.LIBRARY:
             url = self._join(f'me/library/songs/{id}/{relationship}')
 
-        return self.__call__('GET', url, params, type)
+        return self.__call__('GET', url, params, type, user=user)
 
     def music_video(self, 
                     id, 
                     storefront = 'en', 
                     params = None, 
-                    type = ResourceType.CATALOG
+                    type = ResourceType.CATALOG,
+                    user = None
                     ):
 
         url = None
@@ -299,12 +835,14 @@ class Client:
         else:
             raise ResourceTypeException()
         
-        return self.__call__('GET', url, params, type)
+        return self.__call__('GET', url, params, type, user=user)
 
     def music_videos(self, 
                         storefront = 'en', 
                         params = None, 
-                        type = ResourceType.CATALOG
+                        type = ResourceType.CATALOG,
+                        ids = None,
+                        user = None
                     ):
         
         url = None
@@ -316,14 +854,18 @@ class Client:
         else:
             raise ResourceTypeException()
 
-        return self.__call__('GET', url, params, type)
+        if ids is not None:
+            return self._fetch_ids(url, params, type, ids, 'music-videos', user)
+
+        return self.__call__('GET', url, params, type, user=user)
 
     def music_video_relationship(self, 
                                 id, 
                                 relationship, 
                                 storefront = 'en', 
                                 params = None, 
-                                type = ResourceType.CATALOG
+                                type = ResourceType.CATALOG,
+                                user = None
                                 ):
 
         url = None
@@ -335,7 +877,7 @@ class Client:
         else:
             raise ResourceTypeException()
 
-        return self.__call__('GET', url, params, type)
+        return self.__call__('GET', url, params, type, user=user)
 
     def music_video_relationship_view(self, 
                                         id, 
@@ -351,7 +893,8 @@ class Client:
                 id, 
                 storefront = 'en', 
                 params = None, 
-                type = ResourceType.CATALOG
+                type = ResourceType.CATALOG,
+                user = None
                 ):
 
         url = None
@@ -363,12 +906,14 @@ class Client:
         else:
             raise ResourceTypeException()
 
-        return self.__call__('GET', url, params, type)
+        return self.__call__('GET', url, params, type, user=user)
 
     def playlists(self, 
                     storefront = 'en', 
                     params = None, 
-                    type = ResourceType.CATALOG
+                    type = ResourceType.CATALOG,
+                    ids = None,
+                    user = None
                 ):
 
         url = None
@@ -380,14 +925,18 @@ class Client:
         else:
             raise ResourceTypeException()
 
-        return self.__call__('GET', url, params, type)
+        if ids is not None:
+            return self._fetch_ids(url, params, type, ids, 'playlists', user)
+
+        return self.__call__('GET', url, params, type, user=user)
 
     def playlist_relationship(self, 
                                 id, 
                                 relationship, 
                                 storefront = 'en', 
                                 params = None, 
-                                type = ResourceType.CATALOG
+                                type = ResourceType.CATALOG,
+                                user = None
                             ):
         
         url = None
@@ -399,51 +948,54 @@ class Client:
         else:
             raise ResourceTypeException()
 
-        return self.__call__('GET', url, params, type)
+        return self.__call__('GET', url, params, type, user=user)
 
     def playlist_relationship_view(self, id, view, storefront = 'en', params = None):
         
         url = self._join(f'catalog/{storefront}/playlists/{id}/view/{view}')
         return self.__call__('GET', url, params, ResourceType.CATALOG)
 
-    def create_playlist(self, body = None, params = None):
+    def create_playlist(self, body = None, params = None, user = None):
 
         url = self._join(f'me/library/playlists')
-        return self.__call__('POST', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('POST', url, params, ResourceType.LIBRARY, body, user)
 
-    def add_tracks_to_playlist(self, id, body = None, params = None):
+    def add_tracks_to_playlist(self, id, body = None, params = None, user = None):
 
         url = self._join(f'me/library/playlists/{id}/tracks')
-        return self.__call__('POST', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('POST', url, params, ResourceType.LIBRARY, body, user)
 
-    def playlist_folder(self, id, params = None):
+    def playlist_folder(self, id, params = None, user = None):
         
         url = self._join(f'me/library/playlist-folders/{id}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def playlist_folders(self, params = None):
+    def playlist_folders(self, params = None, user = None):
 
         url = self._join(f'me/library/playlist-folders')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def playlist_folder_relationship(self, id, relationship, params = None):
+    def playlist_folder_relationship(self, id, relationship, params = None, user = None):
 
         url = self._join(f'me/library/playlist-folders/{id}/{relationship}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def create_playlist_folder(self, body = None, params = None):
+    def create_playlist_folder(self, body = None, params = None, user = None):
 
         url = self._join(f'me/library/playlist-folders')
-        return self.__call__('POST', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('POST', url, params, ResourceType.LIBRARY, body, user)
     
     def station(self, id, storefront = 'en', params = None):
         
         url = self._join(f'catalog/{storefront}/stations/{id}')
         return self.__call__('GET', url, params, ResourceType.CATALOG)
 
-    def stations(self, storefront = 'en', params = None):
+    def stations(self, storefront = 'en', params = None, ids = None):
 
         url = self._join(f'catalog/{storefront}/stations')
+        if ids is not None:
+            return self._fetch_ids(url, params, ResourceType.CATALOG, ids, 'stations')
+
         return self.__call__('GET', url, params, ResourceType.CATALOG)
 
     def station_genre(self, id, storefront = 'en', params = None):
@@ -461,7 +1013,7 @@ class Client:
         url = self._join(f'catalog/{storefront}/station-genres/{id}/{relationship}')
         return self.__call__('GET', url, params, ResourceType.CATALOG)
 
-    def search(self, storefront = 'en', params = None, type = ResourceType.CATALOG):
+    def search(self, storefront = 'en', params = None, type = ResourceType.CATALOG, user = None):
         
         url = None
 
@@ -472,7 +1024,7 @@ class Client:
         else:
             raise ResourceTypeException()
 
-        return self.__call__('GET', url, params, type)
+        return self.__call__('GET', url, params, type, user=user)
 
     def hints(self, storefront = 'en', params = None):
 
@@ -484,205 +1036,205 @@ class Client:
         url = self._join(f'catalog/{storefront}/search/suggestions')
         return self.__call__('GET', url, params, ResourceType.CATALOG)
 
-    def personal_album_rating(self, id, params = None):
+    def personal_album_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/albums/{id}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_music_video_rating(self, id, params = None):
+    def personal_music_video_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/music-videos/{id}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_playlist_rating(self, id, params = None):
+    def personal_playlist_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/playlists/{id}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_song_rating(self, id, params = None):
+    def personal_song_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/songs/{id}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_station_rating(self, id, params = None):
+    def personal_station_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/stations/{id}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_album_ratings(self, params = None):
+    def personal_album_ratings(self, params = None, user = None):
 
         url = self._join(f'me/ratings/albums')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_music_video_ratings(self, params = None):
+    def personal_music_video_ratings(self, params = None, user = None):
 
         url = self._join(f'me/ratings/music-videos')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_playlist_ratings(self, params = None):
+    def personal_playlist_ratings(self, params = None, user = None):
 
         url = self._join(f'me/ratings/playlists')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_song_ratings(self, params = None):
+    def personal_song_ratings(self, params = None, user = None):
 
         url = self._join(f'me/ratings/songs')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_station_ratings(self, params = None):
+    def personal_station_ratings(self, params = None, user = None):
 
         url = self._join(f'me/ratings/stations')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def add_personal_album_rating(self, id, body, params = None):
+    def add_personal_album_rating(self, id, body, params = None, user = None):
 
         url = self._join(f'me/ratings/albums/{id}')
-        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body, user)
 
-    def add_personal_music_video_rating(self, id, body, params = None):
+    def add_personal_music_video_rating(self, id, body, params = None, user = None):
 
         url = self._join(f'me/ratings/music-videos/{id}')
-        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body, user)
 
-    def add_personal_playlist_rating(self, id, body, params = None):
+    def add_personal_playlist_rating(self, id, body, params = None, user = None):
 
         url = self._join(f'me/ratings/playlists/{id}')
-        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body, user)
 
-    def add_personal_song_rating(self, id, body, params = None):
+    def add_personal_song_rating(self, id, body, params = None, user = None):
 
         url = self._join(f'me/ratings/songs/{id}')
-        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body, user)
 
-    def add_personal_station_rating(self, id, body, params = None):
+    def add_personal_station_rating(self, id, body, params = None, user = None):
 
         url = self._join(f'me/ratings/stations/{id}')
-        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body, user)
 
-    def delete_personal_album_rating(self, id, params = None):
+    def delete_personal_album_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/albums/{id}')
-        return self.__call__('DELETE', url, params, ResourceType.LIBRARY)
+        return self.__call__('DELETE', url, params, ResourceType.LIBRARY, user=user)
 
-    def delete_personal_music_video_rating(self, id, params = None):
+    def delete_personal_music_video_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/music-videos/{id}')
-        return self.__call__('DELETE', url, params, ResourceType.LIBRARY)
+        return self.__call__('DELETE', url, params, ResourceType.LIBRARY, user=user)
 
-    def delete_personal_playlist_rating(self, id, params = None):
+    def delete_personal_playlist_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/playlists/{id}')
-        return self.__call__('DELETE', url, params, ResourceType.LIBRARY)
+        return self.__call__('DELETE', url, params, ResourceType.LIBRARY, user=user)
 
-    def delete_personal_song_rating(self, id, params = None):
+    def delete_personal_song_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/songs/{id}')
-        return self.__call__('DELETE', url, params, ResourceType.LIBRARY)
+        return self.__call__('DELETE', url, params, ResourceType.LIBRARY, user=user)
 
-    def delete_personal_station_rating(self, id, params = None):
+    def delete_personal_station_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/stations/{id}')
-        return self.__call__('DELETE', url, params, ResourceType.LIBRARY)
+        return self.__call__('DELETE', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_library_album_rating(self, id, params = None):
+    def personal_library_album_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/library-albums/{id}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_library_music_video_rating(self, id, params = None):
+    def personal_library_music_video_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/library-music-videos/{id}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_library_playlist_rating(self, id, params = None):
+    def personal_library_playlist_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/library-playlists/{id}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_library_song_rating(self, id, params = None):
+    def personal_library_song_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/library-songs/{id}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_library_station_rating(self, id, params = None):
+    def personal_library_station_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/library-stations/{id}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_library_album_ratings(self, params = None):
+    def personal_library_album_ratings(self, params = None, user = None):
 
         url = self._join(f'me/ratings/library-albums')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_library_music_video_ratings(self, params = None):
+    def personal_library_music_video_ratings(self, params = None, user = None):
 
         url = self._join(f'me/ratings/library-music-videos')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_library_playlist_ratings(self, params = None):
+    def personal_library_playlist_ratings(self, params = None, user = None):
 
         url = self._join(f'me/ratings/library-playlists')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_library_song_ratings(self, params = None):
+    def personal_library_song_ratings(self, params = None, user = None):
 
         url = self._join(f'me/ratings/library-songs')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def personal_library_station_ratings(self, params = None):
+    def personal_library_station_ratings(self, params = None, user = None):
 
         url = self._join(f'me/ratings/library-stations')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def add_personal_library_album_rating(self, id, body, params = None):
+    def add_personal_library_album_rating(self, id, body, params = None, user = None):
 
         url = self._join(f'me/ratings/library-albums/{id}')
-        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body, user)
 
-    def add_personal_library_music_video_rating(self, id, body, params = None):
+    def add_personal_library_music_video_rating(self, id, body, params = None, user = None):
 
         url = self._join(f'me/ratings/library-music-videos/{id}')
-        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body, user)
 
-    def add_personal_library_playlist_rating(self, id, body, params = None):
+    def add_personal_library_playlist_rating(self, id, body, params = None, user = None):
 
         url = self._join(f'me/ratings/library-playlists/{id}')
-        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body, user)
 
-    def add_personal_library_song_rating(self, id, body, params = None):
+    def add_personal_library_song_rating(self, id, body, params = None, user = None):
 
         url = self._join(f'me/ratings/library-songs/{id}')
-        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body, user)
 
-    def add_personal_library_station_rating(self, id, body, params = None):
+    def add_personal_library_station_rating(self, id, body, params = None, user = None):
 
         url = self._join(f'me/ratings/library-stations/{id}')
-        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body)
+        return self.__call__('PUT', url, params, ResourceType.LIBRARY, body, user)
 
-    def delete_personal_library_album_rating(self, id, params = None):
+    def delete_personal_library_album_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/library-albums/{id}')
-        return self.__call__('DELETE', url, params, ResourceType.LIBRARY)
+        return self.__call__('DELETE', url, params, ResourceType.LIBRARY, user=user)
 
-    def delete_personal_library_music_video_rating(self, id, params = None):
+    def delete_personal_library_music_video_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/library-music-videos/{id}')
-        return self.__call__('DELETE', url, params, ResourceType.LIBRARY)
+        return self.__call__('DELETE', url, params, ResourceType.LIBRARY, user=user)
 
-    def delete_personal_library_playlist_rating(self, id, params = None):
+    def delete_personal_library_playlist_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/library-playlists/{id}')
-        return self.__call__('DELETE', url, params, ResourceType.LIBRARY)
+        return self.__call__('DELETE', url, params, ResourceType.LIBRARY, user=user)
 
-    def delete_personal_library_song_rating(self, id, params = None):
+    def delete_personal_library_song_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/library-songs/{id}')
-        return self.__call__('DELETE', url, params, ResourceType.LIBRARY)
+        return self.__call__('DELETE', url, params, ResourceType.LIBRARY, user=user)
 
-    def delete_personal_library_station_rating(self, id, params = None):
+    def delete_personal_library_station_rating(self, id, params = None, user = None):
 
         url = self._join(f'me/ratings/library-stations/{id}')
-        return self.__call__('DELETE', url, params, ResourceType.LIBRARY)
+        return self.__call__('DELETE', url, params, ResourceType.LIBRARY, user=user)
 
     def genre(self, id, storefront = 'en', params = None):
 
@@ -729,52 +1281,52 @@ class Client:
         url = self._join(f'catalog/{storefront}/record-labels/{id}/view/{view}')
         return self.__call__('GET', url, params, ResourceType.CATALOG)
 
-    def recommendation(self, id, params = None):
+    def recommendation(self, id, params = None, user = None):
 
         url = self._join(f'me/recommendations/{id}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def recommendations(self, params = None):
+    def recommendations(self, params = None, user = None):
 
         url = self._join(f'me/recommendations')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def recommendation_relationship(self, id, relationship, params = None):
+    def recommendation_relationship(self, id, relationship, params = None, user = None):
 
         url = self._join(f'me/recommendations/{id}/{relationship}')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def heavy_rotation(self, params = None):
+    def heavy_rotation(self, params = None, user = None):
 
         url = self._join(f'me/history/heavy-rotation')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def recently_played(self, params = None):
+    def recently_played(self, params = None, user = None):
 
         url = self._join(f'me/recent/played')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def recently_played_tracks(self, params = None):
+    def recently_played_tracks(self, params = None, user = None):
 
         url = self._join(f'me/recent/played/tracks')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def recently_played_stations(self, params = None):
+    def recently_played_stations(self, params = None, user = None):
 
         url = self._join(f'me/recent/radio-stations')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
-    def recently_added_resources(self, params = None):
+    def recently_added_resources(self, params = None, user = None):
 
         url = self._join(f'me/library/recently-added')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
 
     def catalog_resources(self, storefront = 'en', params = None):
 
         url = self._join(f'catalog/{storefront}')
         return self.__call__('GET', url, params, ResourceType.CATALOG)
 
-    def library_resources(self, params = None):
+    def library_resources(self, params = None, user = None):
 
         url = self._join(f'me/library')
-        return self.__call__('GET', url, params, ResourceType.LIBRARY)
\ No newline at end of file
+        return self.__call__('GET', url, params, ResourceType.LIBRARY, user=user)
\ No newline at end of file
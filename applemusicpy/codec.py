@@ -0,0 +1,85 @@
+"""
+Module implements JSON codecs used by Client to decode responses and encode request bodies
+"""
+
+import json
+from abc import ABCMeta, abstractmethod
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+from applemusicpy.exceptions import AppleMusicClientException
+
+class CodecBase(metaclass = ABCMeta):
+    """
+    CodecBase is useful when one wants to plug in a custom JSON library.
+    `decode` takes response bytes, `encode` returns request body bytes.
+    """
+
+    @abstractmethod
+    def decode(self, data):
+        pass
+
+    @abstractmethod
+    def encode(self, value):
+        pass
+
+class JSONCodec(CodecBase):
+    """
+    JSONCodec uses the standard library json module
+    """
+
+    def decode(self, data):
+        return json.loads(data)
+
+    def encode(self, value):
+        return json.dumps(value, separators=(',', ':')).encode('UTF-8')
+
+class OrjsonCodec(CodecBase):
+    """
+    OrjsonCodec uses the optional orjson dependency
+    """
+
+    def __init__(self):
+        if orjson is None:
+            raise AppleMusicClientException("OrjsonCodec requires orjson to be installed")
+
+    def decode(self, data):
+        return orjson.loads(data)
+
+    def encode(self, value):
+        return orjson.dumps(value)
+
+class MsgspecCodec(CodecBase):
+    """
+    MsgspecCodec uses the optional msgspec dependency
+    """
+
+    def __init__(self):
+        if msgspec is None:
+            raise AppleMusicClientException("MsgspecCodec requires msgspec to be installed")
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def decode(self, data):
+        return self._decoder.decode(data)
+
+    def encode(self, value):
+        return self._encoder.encode(value)
+
+def default_codec():
+    """
+    Returns the fastest codec available: orjson, msgspec, then the standard library
+    """
+    if orjson is not None:
+        return OrjsonCodec()
+    if msgspec is not None:
+        return MsgspecCodec()
+    return JSONCodec()
@@ -9,4 +9,30 @@ class AppleMusicAuthException(AppleMusicException):
 
 
 class ResourceTypeException(AppleMusicClientException):
-    pass
\ No newline at end of file
+    pass
+
+class AppleMusicRequestException(AppleMusicClientException):
+    """
+    Raised when a request couldn't be completed, e.g. on connection error or timeout
+    """
+    pass
+
+
+class AppleMusicHTTPException(AppleMusicClientException):
+    """
+    Raised when API responds with an error status
+    """
+    def __init__(self, status, message = None, url = None, body = None):
+        super().__init__(message or f'{status} Error for url: {url}')
+        self.status = status
+        self.url = url
+        self.body = body
+
+
+class AppleMusicRateLimitException(AppleMusicHTTPException):
+    """
+    Raised when API keeps responding with 429 Too Many Requests
+    """
+    def __init__(self, status, message = None, url = None, body = None, retry_after = None):
+        super().__init__(status, message, url, body)
+        self.retry_after = retry_after
@@ -0,0 +1,296 @@
+"""
+Module implements columnar export of list endpoints to Parquet, Arrow and NumPy files
+"""
+
+import datetime
+import json
+import os
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from applemusicpy.exceptions import AppleMusicClientException
+
+# Column name -> (dotted path in a resource, column type)
+DEFAULT_COLUMNS = {
+    'id': ('id', 'str'),
+    'type': ('type', 'str'),
+    'name': ('attributes.name', 'str'),
+    'artistName': ('attributes.artistName', 'str'),
+    'albumName': ('attributes.albumName', 'str'),
+    'durationInMillis': ('attributes.durationInMillis', 'int'),
+    'trackNumber': ('attributes.trackNumber', 'int'),
+    'trackCount': ('attributes.trackCount', 'int'),
+    'releaseDate': ('attributes.releaseDate', 'date'),
+    'genreNames': ('attributes.genreNames', 'list')
+}
+
+FORMATS = {
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+    'numpy': '.npy'
+}
+
+def _date(value):
+    """
+    Parses release dates, which may be given as year or month only
+    """
+    if isinstance(value, datetime.date):
+        return value
+    parts = [int(part) for part in value[:10].split('-')]
+    return datetime.date(*(parts + [1] * (3 - len(parts))))
+
+class ColumnarExporter:
+    """
+    ColumnarExporter reads every page of a list endpoint into per-column buffers
+    and writes them out as part files of `rows_per_part` rows, without building
+    a dict per row:
+
+        exporter = ColumnarExporter(client, 'export/library-songs', format='parquet')
+        exporter.export(client.songs, type=ResourceType.LIBRARY)
+        table = exporter.read()
+
+    `columns` maps column names to (dotted path, type) with type one of 'str', 'int',
+    'float', 'bool', 'date' or 'list'; numeric segments of a path index lists,
+    e.g. 'relationships.artists.data.0.id'. After every page its rows are staged
+    and a checkpoint with the next page is saved in `path`, so an interrupted
+    export resumes from the last completed page.
+
+    Parquet and Arrow formats require pyarrow, 'numpy' writes structured arrays
+    and requires numpy. In those, missing values are -1 for 'int', NaN for 'float',
+    False for 'bool' and NaT for 'date'.
+    """
+
+    CHECKPOINT = 'checkpoint.json'
+    STAGING = 'staging.jsonl'
+
+    def __init__(self, client, path, columns = None, format = 'parquet', rows_per_part = 100000):
+        if format not in FORMATS:
+            raise AppleMusicClientException(f"Unknown export format {format}")
+        if format == 'numpy' and numpy is None:
+            raise AppleMusicClientException("NumPy export requires numpy to be installed")
+        if format != 'numpy' and pyarrow is None:
+            raise AppleMusicClientException(f"{format} export requires pyarrow to be installed")
+
+        self.client = client
+        self.path = path
+        self.columns = dict(columns or DEFAULT_COLUMNS)
+        self.format = format
+        self.rows_per_part = rows_per_part
+        self._paths = [(name, tuple(int(key) if key.isdigit() else key for key in dotted.split('.')), type)
+                        for name, (dotted, type) in self.columns.items()]
+        os.makedirs(path, exist_ok=True)
+
+    def export(self, endpoint, *args, page_size = None, restart = False, **kwargs):
+        """
+        Exports all resources of the endpoint and returns paths of the part files
+        """
+        request = self.client._prepare(endpoint, *args, **kwargs)
+        url = request.url
+        params = dict(request.params or {})
+        if page_size is not None:
+            params['limit'] = page_size
+
+        key = self.client._cache_key(request.method, url, params)
+        checkpoint = None if restart else self._load_checkpoint()
+        buffers = self._buffers()
+        if checkpoint is not None and checkpoint['request'] == key and checkpoint['format'] == self.format \
+                and checkpoint['columns'] == json.loads(json.dumps(self.columns)):
+            if checkpoint['done']:
+                return self._files(checkpoint['parts'])
+            url, params, parts, rows = checkpoint['url'], checkpoint['params'], checkpoint['parts'], checkpoint['rows']
+            buffered = self._restore(buffers, checkpoint['staged'])
+        else:
+            self._remove_parts()
+            parts, rows, buffered = 0, 0, 0
+            open(self._staging(), 'w').close()
+
+        with open(self._staging(), 'a') as staging:
+            while url is not None:
+                page = self.client(request.method, url, params, request.type, user=request.user)
+                if not isinstance(page, dict) or not page:
+                    break
+
+                buffered = buffered + self._append(buffers, page.get('data', []), staging)
+                url, params = self.client._next_page(page, params)
+
+                if buffered >= self.rows_per_part:
+                    self._write(buffers, parts)
+                    parts, rows = parts + 1, rows + buffered
+                    buffers, buffered = self._buffers(), 0
+                    self._save_checkpoint(key, url, params, parts, rows, 0, False)
+                    staging.seek(0)
+                    staging.truncate()
+                else:
+                    staging.flush()
+                    self._save_checkpoint(key, url, params, parts, rows, buffered, False)
+
+            if buffered:
+                self._write(buffers, parts)
+                parts, rows = parts + 1, rows + buffered
+            self._save_checkpoint(key, None, None, parts, rows, 0, True)
+            staging.seek(0)
+            staging.truncate()
+        return self._files(parts)
+
+    def read(self):
+        """
+        Returns the exported parts as one pyarrow.Table, or one NumPy array for 'numpy' format
+        """
+        checkpoint = self._load_checkpoint()
+        files = self._files(checkpoint['parts'] if checkpoint is not None else 0)
+
+        if self.format == 'numpy':
+            if not files:
+                return numpy.empty(0, dtype=self._dtype())
+            return numpy.concatenate([numpy.load(file, allow_pickle=True) for file in files])
+        if not files:
+            return self._schema().empty_table()
+        if self.format == 'parquet':
+            return pyarrow.concat_tables([pyarrow.parquet.read_table(file) for file in files])
+        return pyarrow.concat_tables([pyarrow.ipc.open_file(file).read_all() for file in files])
+
+    def _buffers(self):
+        return [[] for _ in self._paths]
+
+    def _append(self, buffers, resources, staging):
+        """
+        Appends column values of resources to buffers, and as JSON lines to `staging`
+        """
+        for resource in resources:
+            row = []
+            for buffer, (_, path, _) in zip(buffers, self._paths):
+                value = resource
+                for key in path:
+                    try:
+                        value = value[key]
+                    except (KeyError, IndexError, TypeError):
+                        value = None
+                        break
+                buffer.append(value)
+                row.append(value)
+            staging.write(json.dumps(row, separators=(',', ':')) + '\n')
+        return len(resources)
+
+    def _restore(self, buffers, staged):
+        """
+        Reloads the first `staged` rows of the staging file into buffers, dropping
+        rows of a page that was not checkpointed
+        """
+        try:
+            with open(self._staging()) as f:
+                lines = f.readlines()[:staged]
+        except FileNotFoundError:
+            lines = []
+
+        with open(self._staging(), 'w') as f:
+            f.writelines(lines)
+        for line in lines:
+            for buffer, value in zip(buffers, json.loads(line)):
+                buffer.append(value)
+        return len(lines)
+
+    def _staging(self):
+        return os.path.join(self.path, self.STAGING)
+
+    def _file(self, part):
+        return os.path.join(self.path, f'part-{part:05d}{FORMATS[self.format]}')
+
+    def _files(self, parts):
+        return [self._file(part) for part in range(parts)]
+
+    def _remove_parts(self):
+        for name in os.listdir(self.path):
+            if name.startswith('part-') and name.endswith(FORMATS[self.format]):
+                os.remove(os.path.join(self.path, name))
+
+    def _write(self, buffers, part):
+        file = self._file(part)
+        temp = file + '.tmp'
+
+        if self.format == 'numpy':
+            with open(temp, 'wb') as f:
+                numpy.save(f, self._array(buffers), allow_pickle=True)
+        else:
+            table = pyarrow.Table.from_arrays(
+                [self._column(buffer, type) for buffer, (_, _, type) in zip(buffers, self._paths)],
+                schema=self._schema()
+            )
+            if self.format == 'parquet':
+                pyarrow.parquet.write_table(table, temp)
+            else:
+                with pyarrow.ipc.new_file(temp, table.schema) as writer:
+                    writer.write_table(table)
+        os.replace(temp, file)
+
+    def _arrow_types(self):
+        return {
+            'str': pyarrow.string(),
+            'int': pyarrow.int64(),
+            'float': pyarrow.float64(),
+            'bool': pyarrow.bool_(),
+            'date': pyarrow.date32(),
+            'list': pyarrow.list_(pyarrow.string())
+        }
+
+    def _schema(self):
+        types = self._arrow_types()
+        return pyarrow.schema([(name, types[type]) for name, _, type in self._paths])
+
+    def _column(self, values, type):
+        if type == 'date':
+            values = [_date(value) if value else None for value in values]
+        return pyarrow.array(values, type=self._arrow_types()[type])
+
+    def _dtype(self):
+        types = {
+            'str': object,
+            'int': 'i8',
+            'float': 'f8',
+            'bool': '?',
+            'date': 'datetime64[D]',
+            'list': object
+        }
+        return numpy.dtype([(name, types[type]) for name, _, type in self._paths])
+
+    def _array(self, buffers):
+        missing = {'int': -1, 'float': numpy.nan, 'bool': False, 'date': numpy.datetime64('NaT')}
+        array = numpy.empty(len(buffers[0]), dtype=self._dtype())
+        for buffer, (name, _, type) in zip(buffers, self._paths):
+            if type == 'date':
+                buffer = [numpy.datetime64(_date(value)) if value else missing[type] for value in buffer]
+            elif type in missing:
+                buffer = [missing[type] if value is None else value for value in buffer]
+            array[name] = buffer
+        return array
+
+    def _load_checkpoint(self):
+        try:
+            with open(os.path.join(self.path, self.CHECKPOINT)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _save_checkpoint(self, key, url, params, parts, rows, staged, done):
+        file = os.path.join(self.path, self.CHECKPOINT)
+        with open(file + '.tmp', 'w') as f:
+            json.dump({
+                'request': key,
+                'columns': self.columns,
+                'format': self.format,
+                'url': url,
+                'params': params,
+                'parts': parts,
+                'rows': rows,
+                'staged': staged,
+                'done': done
+            }, f)
+        os.replace(file + '.tmp', file)
@@ -0,0 +1,217 @@
+"""
+Module implements loaders batching single resource lookups into catalog_resources requests
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from .client import MAX_IDS
+
+class _LoaderBase:
+
+    def __init__(self, client, storefront = 'en', params = None, window = 0.005, max_batch = 100):
+        self.client = client
+        self.storefront = storefront
+        self.params = params
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = {}
+
+    def _batches(self, keys):
+        """
+        Groups (type, id) keys into params for as few catalog_resources requests as possible,
+        never putting more ids of one type into a request than that type allows
+        """
+        ids = {}
+        for type, id in keys:
+            ids.setdefault(type, []).append(id)
+
+        batches = []
+        for type, type_ids in ids.items():
+            size = self.client.max_ids.get(type, min(MAX_IDS.values()))
+            for index, start in enumerate(range(0, len(type_ids), size)):
+                if index == len(batches):
+                    batches.append(dict(self.params or {}))
+                batches[index][f'ids[{type}]'] = ','.join(type_ids[start:start + size])
+
+        return batches
+
+    def _resolve(self, pending, response):
+        found = {}
+        if isinstance(response, dict):
+            for resource in response.get('data', []):
+                found[(resource.get('type'), resource.get('id'))] = resource
+
+        for key, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(found.get(key))
+
+    def _fail(self, pending, error):
+        for futures in pending.values():
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+
+    def _split(self, pending, batch):
+        keys = set()
+        for name, value in batch.items():
+            if name.startswith('ids['):
+                type = name[4:-1]
+                keys.update((type, id) for id in value.split(','))
+
+        return {key: futures for key, futures in pending.items() if key in keys}
+
+class CatalogLoader(_LoaderBase):
+    """
+    CatalogLoader coalesces lookups made from any thread within `window` seconds
+    into catalog_resources requests. Each load returns a Future resolved with
+    the resource, or None if it wasn't returned:
+
+        loader = CatalogLoader(client, storefront='us')
+        song, album = loader.load('songs', '1'), loader.load('albums', '2')
+        print(song.result(), album.result())
+
+    A batch is sent as soon as it holds `max_batch` distinct keys. Batches are
+    sent concurrently by up to `workers` threads of the loader, so load() never
+    waits for one. They are not sent on the client's executor, where loads made
+    from within client.map() would wait for batches queued behind themselves.
+    """
+
+    def __init__(self, client, storefront = 'en', params = None, window = 0.005, max_batch = 100, workers = 4):
+        super().__init__(client, storefront, params, window, max_batch)
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._timer = None
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Sends pending lookups and shuts down the loader's threads
+        """
+        self.flush()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def load(self, type, id):
+        future = Future()
+        full = False
+
+        with self._lock:
+            self._pending.setdefault((type, str(id)), []).append(future)
+            if len(self._pending) >= self.max_batch:
+                full = True
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self._dispatch)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if full:
+            self._dispatch()
+        return future
+
+    def load_many(self, keys):
+        return [self.load(type, id) for type, id in keys]
+
+    def flush(self):
+        """
+        Sends pending lookups and waits until their batches complete
+        """
+        wait(self._dispatch())
+
+    def _dispatch(self):
+        """
+        Submits batches of pending lookups to the loader's executor and returns their futures
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if pending and self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='applemusicpy-loader')
+            executor = self._executor
+
+        if not pending:
+            return []
+        return [executor.submit(self._send, self._split(pending, batch), batch)
+                for batch in self._batches(pending.keys())]
+
+    def _send(self, pending, batch):
+        try:
+            response = self.client.catalog_resources(self.storefront, batch)
+        except Exception as e:
+            self._fail(pending, e)
+        else:
+            self._resolve(pending, response)
+
+class AsyncCatalogLoader(_LoaderBase):
+    """
+    AsyncCatalogLoader coalesces lookups awaited on an AsyncClient. With the default
+    window of 0 every load made during one event loop tick ends up in the same batch:
+
+        loader = AsyncCatalogLoader(client, storefront='us')
+        song, album = await asyncio.gather(loader.load('songs', '1'), loader.load('albums', '2'))
+    """
+
+    def __init__(self, client, storefront = 'en', params = None, window = 0, max_batch = 100):
+        super().__init__(client, storefront, params, window, max_batch)
+        self._handle = None
+        # The event loop keeps only weak references to tasks
+        self._tasks = set()
+
+    def load(self, type, id):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault((type, str(id)), []).append(future)
+
+        if len(self._pending) >= self.max_batch:
+            self._schedule_flush()
+        elif self._handle is None:
+            if self.window:
+                self._handle = loop.call_later(self.window, self._schedule_flush)
+            else:
+                self._handle = loop.call_soon(self._schedule_flush)
+        return future
+
+    def load_many(self, keys):
+        return asyncio.gather(*(self.load(type, id) for type, id in keys))
+
+    def _take(self):
+        pending = self._pending
+        self._pending = {}
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        return pending
+
+    def _schedule_flush(self):
+        task = asyncio.ensure_future(self._send(self._take()))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self):
+        await self._send(self._take())
+
+    async def _send(self, pending):
+
+        async def send(batch):
+            batch_pending = self._split(pending, batch)
+            try:
+                response = await self.client.catalog_resources(self.storefront, batch)
+            except Exception as e:
+                self._fail(batch_pending, e)
+            else:
+                self._resolve(batch_pending, response)
+
+        await asyncio.gather(*(send(batch) for batch in self._batches(pending.keys())))
@@ -0,0 +1,167 @@
+"""
+Module implements client-side rate limiting used by Client
+"""
+
+import os
+import struct
+import threading
+import time
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from applemusicpy.exceptions import AppleMusicClientException
+
+class TokenBucket:
+    """
+    TokenBucket refills `rate` tokens per second up to `capacity`.
+    It is shared by all threads holding it.
+    """
+
+    def __init__(self, rate, capacity = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _update(self, tokens, last, now, amount):
+        tokens = min(self.capacity, tokens + (now - last) * self.rate)
+        return tokens - amount
+
+    def reserve(self, amount = 1):
+        """
+        Takes `amount` tokens, going into debt if needed, and returns
+        seconds the caller has to wait before using them
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = self._update(self._tokens, self._last, now, amount)
+            self._last = now
+            tokens = self._tokens
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+    def drain(self, seconds):
+        """
+        Makes following reservations wait at least `seconds`, e.g. after a 429
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._update(self._tokens, self._last, now, 0), -seconds * self.rate)
+            self._last = now
+
+class FileTokenBucket(TokenBucket):
+    """
+    FileTokenBucket keeps its state in a file locked with flock,
+    so it is shared by every process on the host using the same `path`
+    """
+
+    _STATE = struct.Struct('dd')
+
+    def __init__(self, path, rate, capacity = None):
+        if fcntl is None:
+            raise AppleMusicClientException("FileTokenBucket requires fcntl")
+
+        super().__init__(rate, capacity)
+        self.path = path
+        self._fd = None
+        self._pid = None
+
+    def _transaction(self, amount = 0, drain = None):
+        with self._lock:
+            if self._fd is None or self._pid != os.getpid():
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                self._pid = os.getpid()
+
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                state = os.pread(self._fd, self._STATE.size, 0)
+                tokens, last = self._STATE.unpack(state) if len(state) == self._STATE.size else (self.capacity, now)
+
+                tokens = self._update(tokens, last, now, amount)
+                if drain is not None:
+                    tokens = min(tokens, -drain * self.rate)
+
+                os.pwrite(self._fd, self._STATE.pack(tokens, now), 0)
+                return tokens
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def reserve(self, amount = 1):
+        tokens = self._transaction(amount)
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+    def drain(self, seconds):
+        self._transaction(drain=seconds)
+
+class RateLimiter:
+    """
+    RateLimiter holds a token bucket per developer key, optionally narrowed by
+    per-endpoint-class buckets ('catalog', 'search', 'library'):
+
+        limiter = RateLimiter(rate=20, classes={'search': (5, 10)})
+        client = Client(auth=auth, rate_limiter=limiter)
+
+    With `path` set to a directory, buckets are files in it and the budget
+    is shared across processes on the host.
+    """
+
+    def __init__(self, rate, capacity = None, classes = None, path = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.classes = dict(classes or {})
+        self.path = path
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def endpoint_class(url):
+        segments = urlsplit(url).path.split('/')
+        if 'me' in segments:
+            return 'library'
+        if 'search' in segments:
+            return 'search'
+        return 'catalog'
+
+    def _bucket(self, name, rate, capacity):
+        with self._lock:
+            bucket = self._buckets.get(name)
+            if bucket is None:
+                if self.path is None:
+                    bucket = TokenBucket(rate, capacity)
+                else:
+                    bucket = FileTokenBucket(os.path.join(self.path, name + '.bucket'), rate, capacity)
+                self._buckets[name] = bucket
+            return bucket
+
+    def buckets(self, key, url):
+        key = str(key or 'default')
+        buckets = [self._bucket(key, self.rate, self.capacity)]
+
+        endpoint_class = self.endpoint_class(url)
+        if endpoint_class in self.classes:
+            rate, capacity = self.classes[endpoint_class]
+            buckets.append(self._bucket(f'{key}-{endpoint_class}', rate, capacity))
+        return buckets
+
+    def reserve(self, key, url):
+        """
+        Returns seconds to wait before sending a request to `url` with developer key `key`
+        """
+        return max(bucket.reserve() for bucket in self.buckets(key, url))
+
+    def acquire(self, key, url):
+        delay = self.reserve(key, url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def throttled(self, key, url, retry_after = None):
+        """
+        Pauses every request sharing the buckets after API responded with 429
+        """
+        for bucket in self.buckets(key, url):
+            bucket.drain(retry_after if retry_after is not None else 1 / bucket.rate)
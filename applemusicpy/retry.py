@@ -0,0 +1,91 @@
+"""
+Module implements retry policy used by Client
+"""
+
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+class RetryPolicy:
+    """
+    RetryPolicy decides whether and when a failed request is sent again.
+
+    Requests are retried only for idempotent `methods`, on connection errors and on
+    `statuses`, up to `max_retries` times. Delays grow exponentially from `backoff_factor`
+    up to `max_backoff` seconds with full jitter, unless the response carries Retry-After.
+    No retry is scheduled past `deadline` seconds from the first attempt.
+    """
+
+    def __init__(self,
+                max_retries=10,
+                backoff_factor=0.5,
+                max_backoff=60,
+                jitter=True,
+                statuses=(429, 500, 502, 503, 504),
+                methods=('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'),
+                deadline=None
+                ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.deadline = deadline
+
+    def start(self):
+        """
+        Returns monotonic time after which no retry is scheduled, or None
+        """
+        if self.deadline is None:
+            return None
+        return time.monotonic() + self.deadline
+
+    def is_retryable(self, method, status = None):
+        if method.upper() not in self.methods:
+            return False
+        return status is None or status in self.statuses
+
+    def backoff(self, attempt, retry_after = None):
+        if retry_after is not None:
+            return max(0.0, retry_after)
+
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def next_delay(self, method, error, attempt, deadline = None):
+        """
+        Returns seconds to wait before retrying after `error` on given attempt (counted from 0),
+        or None when the request shouldn't be retried
+        """
+        if attempt >= self.max_retries:
+            return None
+        if not self.is_retryable(method, getattr(error, 'status', None)):
+            return None
+
+        delay = self.backoff(attempt, getattr(error, 'retry_after', None))
+        if deadline is not None and time.monotonic() + delay > deadline:
+            return None
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Parses Retry-After header given either as seconds or as HTTP date
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,201 @@
+"""
+Module implements local full-text search over library resources
+"""
+
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+_TOKEN = re.compile(r'\w+')
+
+# Searched attributes and their weights
+FIELDS = {
+    'name': 3.0,
+    'artistName': 2.0,
+    'albumName': 1.0,
+    'curatorName': 1.0,
+    'composerName': 0.5
+}
+
+# Score factor of a query token matching only a prefix of a resource token
+PREFIX_FACTOR = 0.5
+
+def tokenize(text):
+    """
+    Splits text into lowercase tokens without diacritics
+    """
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _TOKEN.findall(text.casefold())
+
+class LibraryIndex:
+    """
+    LibraryIndex answers library searches locally from an inverted index,
+    instead of requesting me/library/search for every query:
+
+        index = LibraryIndex.from_store(store)
+        index.search('tay swi', types=['library-songs'])
+
+        report = sync.sync()
+        index.update(store, report)
+
+    Every query token of at least `min_prefix` characters matches resource tokens
+    starting with it, so partial input works. A resource has to match all query
+    tokens. It is ranked by the weights of the attributes matched (FIELDS), with
+    exact token matches counting more than prefix matches.
+    """
+
+    def __init__(self, fields = None, min_prefix = 2):
+        self.fields = dict(fields or FIELDS)
+        self.min_prefix = min_prefix
+        self._resources = {}
+        self._postings = {}
+        self._tokens = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_store(cls, store, types = None, fields = None, min_prefix = 2):
+        """
+        Builds an index of resources in a LibraryStore
+        """
+        index = cls(fields, min_prefix)
+        for type in types or ('library-songs', 'library-albums', 'library-artists',
+                            'library-playlists', 'library-music-videos'):
+            index.add_many(store.resources(type))
+        return index
+
+    def __len__(self):
+        return len(self._resources)
+
+    def add(self, resource):
+        """
+        Indexes a resource, replacing an earlier version of it
+        """
+        weights = self._weights(resource)
+        with self._lock:
+            self._add(resource, weights)
+
+    def add_many(self, resources):
+        """
+        Indexes resources like add(), sorting the tokens they bring once at the end
+        """
+        added = set()
+        with self._lock:
+            for resource in resources:
+                self._add(resource, self._weights(resource), added)
+            if added:
+                self._tokens.extend(added)
+                self._tokens.sort()
+
+    def _weights(self, resource):
+        weights = {}
+        attributes = resource.get('attributes') or {}
+        for field, weight in self.fields.items():
+            value = attributes.get(field)
+            if isinstance(value, str):
+                for token in tokenize(value):
+                    weights[token] = max(weights.get(token, 0.0), weight)
+        return weights
+
+    def _add(self, resource, weights, added = None):
+        """
+        Indexes a resource. New tokens are inserted into the sorted token list,
+        or collected in `added` when given
+        """
+        key = (resource['type'], resource['id'])
+        self._remove(key, added)
+        self._resources[key] = (resource, tuple(weights))
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                if added is None:
+                    insort(self._tokens, token)
+                else:
+                    added.add(token)
+            postings[key] = weight
+
+    def remove(self, type, id):
+        with self._lock:
+            self._remove((type, id))
+
+    def _remove(self, key, added = None):
+        entry = self._resources.pop(key, None)
+        if entry is None:
+            return
+
+        for token in entry[1]:
+            postings = self._postings[token]
+            del postings[key]
+            if not postings:
+                del self._postings[token]
+                if added is not None and token in added:
+                    added.discard(token)
+                else:
+                    del self._tokens[bisect_left(self._tokens, token)]
+
+    def update(self, store, report):
+        """
+        Applies a SyncReport of LibrarySync to the index
+        """
+        for type, id in report.removed:
+            self.remove(type, id)
+        resources = (store.get(type, id) for type, id in report.added + report.changed)
+        self.add_many(resource for resource in resources if resource is not None)
+
+    def _matches(self, token):
+        """
+        Returns {key: score} of resources having a token starting with `token`
+        """
+        if len(token) < self.min_prefix:
+            return dict(self._postings.get(token, {}))
+
+        scores = {}
+        tokens = self._tokens
+        index = bisect_left(tokens, token)
+        while index < len(tokens) and tokens[index].startswith(token):
+            candidate = tokens[index]
+            factor = 1.0 if candidate == token else PREFIX_FACTOR
+            for key, weight in self._postings[candidate].items():
+                score = weight * factor
+                if score > scores.get(key, 0.0):
+                    scores[key] = score
+            index = index + 1
+        return scores
+
+    def query(self, term, types = None, limit = 25):
+        """
+        Returns up to `limit` (score, resource) pairs best matching `term`
+        """
+        tokens = sorted(set(tokenize(term)), key=len, reverse=True)
+        if not tokens:
+            return []
+
+        with self._lock:
+            scores = None
+            for token in tokens:
+                matches = self._matches(token)
+                if scores is None:
+                    scores = matches
+                else:
+                    scores = {key: score + matches[key] for key, score in scores.items() if key in matches}
+                if not scores:
+                    return []
+
+            if types is not None:
+                scores = {key: score for key, score in scores.items() if key[0] in types}
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            return [(score, self._resources[key][0]) for key, score in ranked]
+
+    def search(self, term, types = None, limit = 25):
+        """
+        Returns results shaped like a response of me/library/search, up to `limit` per type
+        """
+        results = {}
+        for score, resource in self.query(term, types, None):
+            data = results.setdefault(resource['type'], {'data': []})['data']
+            if len(data) < limit:
+                data.append(resource)
+        return {'results': results}
@@ -0,0 +1,106 @@
+"""
+Module implements token stores used by Auth to persist tokens between processes
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from abc import ABCMeta, abstractmethod
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from applemusicpy.exceptions import AppleMusicAuthException
+
+class TokenStoreBase(metaclass = ABCMeta):
+    """
+    TokenStoreBase is useful when one wants to implement custom token store.
+    Entries are dicts saved under a name. With `encryption_key`
+    (see cryptography.fernet.Fernet.generate_key) they are encrypted at rest.
+    """
+
+    def __init__(self, encryption_key = None):
+        self._fernet = Fernet(encryption_key) if encryption_key is not None else None
+
+    @abstractmethod
+    def load(self, name):
+        pass
+
+    @abstractmethod
+    def save(self, name, value):
+        pass
+
+    def _encode(self, value):
+        data = json.dumps(value).encode('UTF-8')
+        if self._fernet is not None:
+            data = self._fernet.encrypt(data)
+        return data
+
+    def _decode(self, data):
+        if data is None:
+            return None
+        if self._fernet is not None:
+            try:
+                data = self._fernet.decrypt(data)
+            except InvalidToken:
+                raise AppleMusicAuthException("Cannot decrypt stored token")
+        return json.loads(data)
+
+class FileTokenStore(TokenStoreBase):
+    """
+    FileTokenStore keeps one file per entry in `path` directory.
+    Files are replaced atomically, so concurrent readers never see partial writes.
+    """
+
+    def __init__(self, path, encryption_key = None):
+        super().__init__(encryption_key)
+        self.path = path
+        os.makedirs(path, mode=0o700, exist_ok=True)
+
+    def _file(self, name):
+        return os.path.join(self.path, name.replace(os.sep, '_') + '.token')
+
+    def load(self, name):
+        try:
+            with open(self._file(name), 'rb') as f:
+                return self._decode(f.read())
+        except FileNotFoundError:
+            return None
+
+    def save(self, name, value):
+        file = self._file(name)
+        temp = f'{file}.{os.getpid()}.{threading.get_ident()}'
+
+        descriptor = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(self._encode(value))
+        os.replace(temp, file)
+
+class SQLiteTokenStore(TokenStoreBase):
+    """
+    SQLiteTokenStore keeps entries in a SQLite file shared by processes on the host
+    """
+
+    def __init__(self, path, encryption_key = None, timeout = 30):
+        super().__init__(encryption_key)
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+        self._connect().execute('CREATE TABLE IF NOT EXISTS tokens (name TEXT PRIMARY KEY, value BLOB NOT NULL)')
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def load(self, name):
+        row = self._connect().execute('SELECT value FROM tokens WHERE name = ?', (name,)).fetchone()
+        return self._decode(row[0]) if row is not None else None
+
+    def save(self, name, value):
+        self._connect().execute('INSERT OR REPLACE INTO tokens (name, value) VALUES (?, ?)', (name, self._encode(value)))
@@ -0,0 +1,146 @@
+"""
+Module implements incremental parsing of large responses used by Client.stream
+"""
+
+import codecs
+import json
+import re
+
+from applemusicpy.exceptions import AppleMusicRequestException
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+_START, _KEY, _COLON, _VALUE, _ITEM, _ITEM_END, _MEMBER_END, _DONE = range(8)
+
+class DataParser:
+    """
+    DataParser is fed a JSON object chunk by chunk and returns items of its
+    top-level `key` array as soon as each one is complete, so only the unparsed
+    remainder of the body is buffered. Other members end up in `document`:
+
+        parser = DataParser()
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                handle(item)
+        parser.close()
+        parser.document.get('next')
+    """
+
+    def __init__(self, key = 'data'):
+        self.key = key
+        self.document = {}
+        self.count = 0
+        self._decoder = codecs.getincrementaldecoder('UTF-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._state = _START
+        self._member = None
+
+    def feed(self, data, final = False):
+        """
+        Parses `data` (bytes or str) and returns the items completed by it
+        """
+        text = self._decoder.decode(data, final) if isinstance(data, bytes) else data
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+
+        items = []
+        while self._step(items, final):
+            pass
+        return items
+
+    def close(self):
+        """
+        Finishes parsing, raising AppleMusicRequestException if the body was incomplete
+        """
+        items = self.feed(b'', final=True)
+        if self._state != _DONE:
+            raise AppleMusicRequestException("Incomplete JSON response")
+        return items
+
+    def _char(self):
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else None
+
+    def _value(self, final):
+        """
+        Returns (True, value) once a whole value is buffered. A value ending the buffer
+        may be a truncated number or literal, so it is only accepted when final.
+        """
+        try:
+            value, end = self._json.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise AppleMusicRequestException(f"Invalid JSON response at offset {self._pos}")
+            return False, None
+
+        if end == len(self._buffer) and not final:
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _expect(self, char, expected):
+        if char not in expected:
+            raise AppleMusicRequestException(f"Invalid JSON response, unexpected {char!r}")
+
+    def _step(self, items, final):
+        char = self._char()
+        if char is None or self._state == _DONE:
+            return False
+
+        if self._state == _START:
+            self._expect(char, '{')
+            self._pos = self._pos + 1
+            self._state = _KEY
+
+        elif self._state == _KEY:
+            if char == '}':
+                self._pos = self._pos + 1
+                self._state = _DONE
+                return True
+            self._expect(char, '"')
+            done, self._member = self._value(final)
+            if not done:
+                return False
+            self._state = _COLON
+
+        elif self._state == _COLON:
+            self._expect(char, ':')
+            self._pos = self._pos + 1
+            self._state = _VALUE
+
+        elif self._state == _VALUE:
+            if self._member == self.key and char == '[':
+                self._pos = self._pos + 1
+                self._state = _ITEM
+                return True
+            done, value = self._value(final)
+            if not done:
+                return False
+            self.document[self._member] = value
+            self._state = _MEMBER_END
+
+        elif self._state == _ITEM:
+            if char == ']':
+                self._pos = self._pos + 1
+                self._state = _MEMBER_END
+                return True
+            done, value = self._value(final)
+            if not done:
+                return False
+            items.append(value)
+            self.count = self.count + 1
+            self._state = _ITEM_END
+
+        elif self._state == _ITEM_END:
+            self._expect(char, ',]')
+            self._pos = self._pos + 1
+            self._state = _ITEM if char == ',' else _MEMBER_END
+
+        elif self._state == _MEMBER_END:
+            self._expect(char, ',}')
+            self._pos = self._pos + 1
+            self._state = _KEY if char == ',' else _DONE
+
+        return True
@@ -0,0 +1,276 @@
+"""
+Module implements incremental mirroring of a user's library into a local SQLite store
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .cache import _Transaction
+from .client import ResourceType
+
+# Library resource type -> list endpoint of Client
+LIBRARY_TYPES = {
+    'library-albums': 'albums',
+    'library-artists': 'artists',
+    'library-songs': 'songs',
+    'library-music-videos': 'music_videos',
+    'library-playlists': 'playlists'
+}
+
+def _digest(resource):
+    body = json.dumps(resource.get('attributes'), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(body.encode('UTF-8')).hexdigest()[:16]
+
+class LibraryStore:
+    """
+    LibraryStore keeps a mirror of one user's library in a SQLite file:
+    resources by type and id, tracks of every playlist and sync state
+    """
+
+    def __init__(self, path, timeout = 30):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS resources ('
+                'type TEXT NOT NULL, id TEXT NOT NULL, digest TEXT NOT NULL, body TEXT NOT NULL, '
+                'PRIMARY KEY (type, id))'
+            )
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS playlist_tracks ('
+                'playlist TEXT NOT NULL, position INTEGER NOT NULL, type TEXT NOT NULL, id TEXT NOT NULL, '
+                'PRIMARY KEY (playlist, position))'
+            )
+            connection.execute('CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value TEXT NOT NULL)')
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _connection(self):
+        return _Transaction(self._connect())
+
+    def get(self, type, id):
+        row = self._connect().execute('SELECT body FROM resources WHERE type = ? AND id = ?', (type, id)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def resources(self, type = None):
+        """
+        Yields stored resources, of one type if given
+        """
+        if type is None:
+            rows = self._connect().execute('SELECT body FROM resources')
+        else:
+            rows = self._connect().execute('SELECT body FROM resources WHERE type = ?', (type,))
+        for row in rows.fetchall():
+            yield json.loads(row[0])
+
+    def digest(self, type, id):
+        row = self._connect().execute('SELECT digest FROM resources WHERE type = ? AND id = ?', (type, id)).fetchone()
+        return row[0] if row is not None else None
+
+    def digests(self, type):
+        return dict(self._connect().execute('SELECT id, digest FROM resources WHERE type = ?', (type,)).fetchall())
+
+    def count(self, type):
+        return self._connect().execute('SELECT COUNT(*) FROM resources WHERE type = ?', (type,)).fetchone()[0]
+
+    def put(self, resources):
+        """
+        Stores resources and returns (added, changed) lists of (type, id)
+        """
+        added = []
+        changed = []
+        with self._connection() as connection:
+            for resource in resources:
+                key = (resource['type'], resource['id'])
+                digest = _digest(resource)
+                row = connection.execute('SELECT digest FROM resources WHERE type = ? AND id = ?', key).fetchone()
+                if row is not None and row[0] == digest:
+                    continue
+
+                (added if row is None else changed).append(key)
+                connection.execute(
+                    'INSERT OR REPLACE INTO resources (type, id, digest, body) VALUES (?, ?, ?, ?)',
+                    key + (digest, json.dumps(resource, separators=(',', ':')))
+                )
+        return added, changed
+
+    def remove(self, type, ids):
+        with self._connection() as connection:
+            connection.executemany('DELETE FROM resources WHERE type = ? AND id = ?', [(type, id) for id in ids])
+            if type == 'library-playlists':
+                connection.executemany('DELETE FROM playlist_tracks WHERE playlist = ?', [(id,) for id in ids])
+
+    def tracks(self, playlist):
+        return self._connect().execute(
+            'SELECT type, id FROM playlist_tracks WHERE playlist = ? ORDER BY position', (playlist,)
+        ).fetchall()
+
+    def set_tracks(self, playlist, tracks):
+        with self._connection() as connection:
+            connection.execute('DELETE FROM playlist_tracks WHERE playlist = ?', (playlist,))
+            connection.executemany(
+                'INSERT INTO playlist_tracks (playlist, position, type, id) VALUES (?, ?, ?, ?)',
+                [(playlist, position, type, id) for position, (type, id) in enumerate(tracks)]
+            )
+
+    def state(self, name, default = None):
+        row = self._connect().execute('SELECT value FROM state WHERE name = ?', (name,)).fetchone()
+        return json.loads(row[0]) if row is not None else default
+
+    def set_state(self, name, value):
+        with self._connection() as connection:
+            connection.execute('INSERT OR REPLACE INTO state (name, value) VALUES (?, ?)', (name, json.dumps(value)))
+
+class SyncReport:
+    """
+    Changes found by one LibrarySync.sync() run, as lists of (type, id)
+    """
+
+    def __init__(self):
+        self.added = []
+        self.removed = []
+        self.changed = []
+        self.playlists = []
+        self.reconciled = []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed or self.playlists)
+
+    def __repr__(self):
+        return (f'SyncReport(added={len(self.added)}, removed={len(self.removed)}, '
+                f'changed={len(self.changed)}, playlists={len(self.playlists)})')
+
+class LibrarySync:
+    """
+    LibrarySync brings a LibraryStore up to date with a user's library,
+    downloading only what changed since the previous run:
+
+        sync = LibrarySync(client, LibraryStore('alice.db'), user='alice')
+        report = sync.sync()
+        report.added, report.removed, report.changed
+
+    Every run reads `meta.total` of each library type, walks the recently added
+    feed down to the first unchanged item or the newest item of the previous run
+    (the stored high-water mark) and stores what is new or changed, with tracks of
+    such albums. A type is fully listed again only when its stored count still
+    differs from the total, which is how removals are found. Playlists are always
+    listed, and tracks are fetched only for playlists whose lastModifiedDate
+    changed, reported in `playlists`.
+
+    An addition and a removal of the same type between runs keep counts equal and
+    go unnoticed, so pass `full=True` from time to time to reconcile everything.
+    """
+
+    def __init__(self, client, store : LibraryStore, user = None, page_size = 100):
+        self.client = client
+        self.store = store
+        self.user = user
+        self.page_size = page_size
+
+    def _list(self, endpoint, *args, **kwargs):
+        return self.client.paginate(endpoint, *args, page_size=self.page_size,
+                                    type=ResourceType.LIBRARY, user=self.user, **kwargs)
+
+    def _total(self, type):
+        endpoint = getattr(self.client, LIBRARY_TYPES[type])
+        page = endpoint(params={'limit': 1}, type=ResourceType.LIBRARY, user=self.user)
+        return ((page or {}).get('meta') or {}).get('total')
+
+    def sync(self, full = False):
+        report = SyncReport()
+        totals = {type: None if full else self._total(type) for type in LIBRARY_TYPES if type != 'library-playlists'}
+
+        if not full:
+            self._recently_added(report)
+
+        for type, total in totals.items():
+            if total is None or total != self.store.count(type):
+                self._reconcile(type, report)
+
+        self._playlists(report)
+        self.store.set_state('synced', time.time())
+        return report
+
+    def _recently_added(self, report):
+        """
+        Stores new and changed library resources of the recently added feed, with
+        tracks of such albums. Adding songs to a stored album changes it and moves
+        it to the top of the feed, so the walk goes on past changed resources and
+        stops at the first unchanged one or at the high-water mark.
+        """
+        mark = self.store.state('recently-added')
+        newest = None
+        resources = []
+
+        for resource in self.client.paginate(self.client.recently_added_resources, user=self.user):
+            type = resource.get('type')
+            key = [type, resource.get('id')]
+            if newest is None:
+                newest = key
+
+            if type in LIBRARY_TYPES:
+                digest = self.store.digest(*key)
+                if digest == _digest(resource):
+                    break
+                # Playlists are reconciled by _playlists, which needs their previous version
+                if type != 'library-playlists':
+                    resources.append(resource)
+            if key == mark:
+                break
+
+        for album in [resource for resource in resources if resource['type'] == 'library-albums']:
+            resources.extend(self._list(self.client.album_relationship, album['id'], 'tracks'))
+
+        added, changed = self.store.put(resources)
+        report.added.extend(added)
+        report.changed.extend(changed)
+        if newest is not None:
+            self.store.set_state('recently-added', newest)
+
+    def _reconcile(self, type, report):
+        """
+        Lists every resource of `type`, storing new and changed ones and removing missing ones
+        """
+        stored = self.store.digests(type)
+        resources = list(self._list(getattr(self.client, LIBRARY_TYPES[type])))
+
+        added, changed = self.store.put(resources)
+        removed = set(stored) - set(resource['id'] for resource in resources)
+        self.store.remove(type, removed)
+
+        report.added.extend(added)
+        report.changed.extend(changed)
+        report.removed.extend((type, id) for id in sorted(removed))
+        report.reconciled.append(type)
+        return resources
+
+    def _playlists(self, report):
+        """
+        Reconciles playlists and refetches tracks of the ones modified since the last run
+        """
+        previous = {id: (self.store.get('library-playlists', id) or {}).get('attributes', {}).get('lastModifiedDate')
+                    for id in self.store.digests('library-playlists')}
+
+        for playlist in self._reconcile('library-playlists', report):
+            modified = (playlist.get('attributes') or {}).get('lastModifiedDate')
+            if playlist['id'] in previous and modified is not None and modified == previous[playlist['id']]:
+                continue
+
+            tracks = [(track['type'], track['id'])
+                        for track in self._list(self.client.playlist_relationship, playlist['id'], 'tracks')]
+            if [tuple(track) for track in self.store.tracks(playlist['id'])] != tracks:
+                self.store.set_tracks(playlist['id'], tracks)
+                report.playlists.append(playlist['id'])
@@ -1,279 +1,394 @@
 """
 Module implements different resource objects
-"""
 
+Every resource object is generated from SCHEMA below into a class with __slots__.
+Objects wrap the raw response dict: fields are read from it on first access and
+kept in a slot, nested objects are built only when accessed. compact() reads all
+fields at once and drops the raw dict, which keeps large collections small:
+
+    songs = [Songs(song).compact() for song in response['data']]
+    songs[0]._attributes._durationInMillis
+"""
 
-class Albums:
-
-    class Attributes:
-
-        class Artwork:
-            def __init__(self, artwork : dict):
-                self._bgColor = artwork.get('bgColor')
-                self._height = artwork.get('height')
-                self._width = artwork.get('width')
-                self._textColor1 = artwork.get('textColor1')
-                self._textColor2 = artwork.get('textColor2')
-                self._textColor3 = artwork.get('textColor3')
-                self._textColor4 = artwork.get('textColor4')
-                self._url = artwork.get('url')
-
-        class EditorialNotes:
-            def __init__(self, editorialNotes : dict):
-                self._short = editorialNotes.get('short')
-                self._standard = editorialNotes.get('standard')
-                self._name = editorialNotes.get('name')
-                self._tagline = editorialNotes.get('tagline')
-
-        class PlayParameters:
-            def __init__(self, playParams : dict):
-                self._id = playParams.get('id')
-                self._kind = playParams.get('kind')
-
-        def __init__(self, attributes : dict):
-            self._artistName = attributes.get('artistName')
-            self._artistUrl = attributes.get('artistUrl')
-            self._artwork = self.Artwork(attributes.get('artwork'))
-            self._contentRating = attributes.get('contentRating')
-            self._copyright = attributes.get('copyright')
-            self._editorialNotes = self.EditorialNotes(attributes.get('editorialNotes'))
-            self._genreNames = list(attributes.get('genreNames'))
-            self._isCompilation = attributes.get('isCompilation')
-            self._isComplete = attributes.get('isComplete')
-            self._isMasteredForItunes = attributes.get('isMasteredForItunes')
-            self._isSingle = attributes.get('isSingle')
-            self._name = attributes.get('name')
-            self._playParams = self.PlayParameters(attributes.get('playParams'))
-            self._recordLabel = attributes.get('recordLabel')
-            self._releaseDate = attributes.get('releaseDate')
-            self._trackCount = attributes.get('trackCount')
-            self._upc = attributes.get('upc')
-            self._url = attributes.get('url')
-
-    class Relationships:
-
-        class AlbumsArtistsRelationship:
-            def __init__(self, albumsArtistsRelationship : dict):
-                self._href = albumsArtistsRelationship.get('href')
-                self._next = albumsArtistsRelationship.get('next')
-                self._data = [Artists(artist) for artist in albumsArtistsRelationship.get('data')]
-
-        class AlbumsGenresRelationship:
-            def __init__(self, albumsGenresRelationship : dict):
-                self._href = albumsGenresRelationship.get('href')
-                self._next = albumsGenresRelationship.get('next')
-                self._data = [Genres(genre) for genre in albumsGenresRelationship.get('data')]
-        
-        class AlbumsTracksRelationship:
-            def __init__(self, albumsTracksRelationship : dict):
-                self._data = [
-                    Songs(track) if track.get('type') == 'songs' else MusicVideos(track) 
-                    for track in albumsTracksRelationship.get('data')
-                ]
-                self._href = albumsTracksRelationship.get('href')
-                self._next = albumsTracksRelationship.get('next')
-
-        class AlbumsLibraryRelationship:
-            def __init__(self, albumsLibraryRelationship : dict):
-                self._href = albumsLibraryRelationship.get('href')
-                self._next = albumsLibraryRelationship.get('next')
-                self._data = [LibraryAlbums(album) for album in albumsLibraryRelationship.get('data')]
-
-        class AlbumsRecordLabelsRelationship:
-            def __init__(self, albumsRecordLabelsRelationship : dict):
-                self._href = albumsRecordLabelsRelationship.get('href')
-                self._next = albumsRecordLabelsRelationship.get('next')
-                self._data = [RecordLabels(label) for label in albumsRecordLabelsRelationship.get('data')]
-
-        def __init__(self, relationships : dict):
-            self._artists = self.AlbumsArtistsRelationship(relationships.get('artists'))
-            self._genres = self.AlbumsGenresRelationship(relationships.get('genres'))
-            self._tracks = self.AlbumsTracksRelationship(relationships.get('tracks'))
-            self._library = self.AlbumsLibraryRelationship(relationships.get('library'))
-            self._record_labels = self.AlbumsRecordLabelsRelationship(relationships.get('record-labels'))
-
-    class Views:
-
-        class AlbumsAppearsOnView:
-
-            class Attributes:
-                def __init__(self, attributes : dict):
-                    self._title = attributes.get('title')
-
-            def __init__(self, albumsAppearsOnView : dict):
-                self._href = albumsAppearsOnView.get('href')
-                self._next = albumsAppearsOnView.get('next')
-                self._attributes = self.Attributes(albumsAppearsOnView.get('attributes'))
-                self._data = [Playlists(playlist) for playlist in albumsAppearsOnView.get('data')]
-
-        class AlbumsOtherVersionsView:
-
-            class Attributes:
-                def __init__(self, attributes : dict):
-                    self._title = attributes.get('title')
-
-            def __init__(self, albumsOtherVersionsView : dict):
-                self._href = albumsOtherVersionsView.get('href')
-                self._next = albumsOtherVersionsView.get('next')
-                self._attributes = self.Attributes(albumsOtherVersionsView.get('attributes'))
-                self._data = [Albums(album) for album in albumsOtherVersionsView.get('data')]
-        
-        class AlbumsRelatedAlbumsView:
-
-            class Attributes:
-                def __init__(self, attributes : dict):
-                    self._title = attributes.get('attributes')
-
-            def __init__(self, albumsRelatedVersionsView : dict):
-                self._href = albumsRelatedVersionsView.get('href')
-                self._next = albumsRelatedVersionsView.get('next')
-                self._attributes = self.Attributes(albumsRelatedVersionsView.get('attributes'))
-                self._data = [Albums(album) for album in albumsRelatedVersionsView.get('data')]
-
-        class AlbumsRelatedVideosView:
-
-            class Attributes:
-                def __init__(self, attributes : dict):
-                    self._title = attributes.get('attributes')
-            
-            def __init__(self, albumsRelatedVideosView : dict):
-                self._href = albumsRelatedVideosView.get('href')
-                self._next = albumsRelatedVideosView.get('next')
-                self._attributes = self.Attributes(albumsRelatedVideosView.get('attributes'))
-                self._data = [MusicVideos(music_video) for music_video in albumsRelatedVideosView.get('data')]
-
-        def __init__(self, views : dict):
-            self._appears_on = self.AlbumsAppearsOnView(views.get('appears-on'))
-            self._other_versions = self.AlbumsOtherVersionsView(views.get('other-versions'))
-            self._related_albums = self.AlbumsRelatedAlbumsView(views.get('related-albums'))
-            self._related_videos = self.AlbumsRelatedVideosView(views.get('related-videos'))
-
-    def __init__(self, albums : dict):
-        self._id = albums.get('id')
-        self._type = albums.get('type')
-        self._href = albums.get('href')
-
-        self._attributes = self.Attributes(albums.get('attributes'))
-        self._relationships = self.Relationships(albums.get('relationships'))
-        self._views = self.Views(albums.get('views'))
-
-
-class LibraryAlbums:
-
-    class Attributes:
-
-        class Artwork:
-            def __init__(self, artwork : dict):
-                self._bgColor = artwork.get('bgColor')
-                self._height = artwork.get('height')
-                self._width = artwork.get('width')
-                self._textColor1 = artwork.get('textColor1')
-                self._textColor2 = artwork.get('textColor2')
-                self._textColor3 = artwork.get('textColor3')
-                self._textColor4 = artwork.get('textColor4')
-                self._url = artwork.get('url')
-
-        class PlayParameters:
-            def __init__(self, playParams : dict):
-                self._id = playParams.get('id')
-                self._kind = playParams.get('kind')
-
-        def __init__(self, attributes : dict):
-            self._artistName = attributes.get('artistName')
-            self._artwork = self.Artwork(attributes.get('artwork'))
-            self._contentRating = attributes.get('contentRating')
-            self._dateAdded = attributes.get('dateAdded')
-            self._name = attributes.get('name')
-            self._playParams = self.PlayParameters(attributes.get('playParams'))
-            self._releaseDate = attributes.get('releaseDate')
-            self._trackCount = attributes.get('trackCount')
-            self._genreNames = list(attributes.get('genreNames'))
-
-    class Relationships:
-
-        class LibraryAlbumsArtistsRelationship:
-            def __init__(self, libraryAlbumsArtistsRelationship : dict):
-                self._href = libraryAlbumsArtistsRelationship.get('href')
-                self._next = libraryAlbumsArtistsRelationship.get('next')
-                self._data = [LibraryArtists(library_artist) for library_artist in libraryAlbumsArtistsRelationship.get('data')]
-
-        class LibraryAlbumsCatalogRelationship:
-            def __init__(self, libraryAlbumsCatalogRelationship : dict):
-                self._href = libraryAlbumsCatalogRelationship.get('href')
-                self._next = libraryAlbumsCatalogRelationship.get('next')
-                self._data = [Albums(album) for album in libraryAlbumsCatalogRelationship.get('data')]
-
-        class LibraryAlbumsTracksRelationship:
-            def __init__(self, libraryAlbumsTracksRelationship : dict):
-                self._href = libraryAlbumsTracksRelationship.get('href')
-                self._next = libraryAlbumsTracksRelationship.get('next')
-                self._data = [
-                    LibrarySongs(track) if track.get('type') == 'library-songs' else LibraryMusicVideos(track) 
-                    for track in libraryAlbumsTracksRelationship
-                ]
-
-        def __init__(self, relationships : dict):
-            self._artists = self.LibraryAlbumsArtistsRelationship(relationships.get('artists'))
-            self._catalog = self.LibraryAlbumsCatalogRelationship(relationships.get('catalog'))
-            self._tracks = self.LibraryAlbumsTracksRelationship(relationships.get('tracks'))
-
-    def __init__(self, libraryAlbums : dict):
-        self._id = libraryAlbums.get('id')
-        self._type = libraryAlbums.get('type')
-        self._href = libraryAlbums.get('href')
-
-        self._attributes = self.Attributes(libraryAlbums.get('attributes'))
-        self._relationships = self.Relationships(libraryAlbums.get('relationships'))
-
-class Artists:
-
-    class Attributes:
-        pass
-
-    class Relationships:
-        pass
-
-    class Views:
-        pass
-
-    def __init__(self, artists : dict):
-        self._id = artists.get('id')
-        self._type = artists.get('type')
-        self._href = artists.get('href')
-
-
-class LibraryArtists:
-    def __init__(self, resource : dict):
-        self.resource = resource
-
-class Songs:
-    def __init__(self, resource : dict):
-        self.resource = resource
-
-class LibrarySongs:
-    def __init__(self, resource : dict):
-        self.resource = resource
-
-class MusicVideos:
-    def __init__(self, resource : dict):
-        self.resource = resource
-
-class LibraryMusicVideos:
-    def __init__(self, resource : dict):
-        self.resource = resource
-
-class Playlists:
-    def __init__(self, resource : dict):
-        self.resource = resource
-
-class Stations:
-    def __init__(self, resource : dict):
-        self.resource = resource
-
-class Genres:
-    def __init__(self, resource : dict):
-        self.resource = resource
-
-class RecordLabels:
-    def __init__(self, resource : dict):
-        self.resource = resource
\ No newline at end of file
+__all__ = [
+    'Resource',
+    'Albums', 'LibraryAlbums', 'Artists', 'LibraryArtists', 'Songs', 'LibrarySongs',
+    'MusicVideos', 'LibraryMusicVideos', 'Playlists', 'LibraryPlaylists', 'LibraryPlaylistFolders',
+    'Stations', 'StationGenres', 'Genres', 'RecordLabels', 'Curators', 'AppleCurators',
+    'Activities', 'Ratings', 'PersonalRecommendation'
+]
+
+
+# Objects nested in attributes: name -> fields
+OBJECTS = {
+    'Artwork': ['bgColor', 'height', 'width', 'textColor1', 'textColor2', 'textColor3', 'textColor4', 'url'],
+    'EditorialNotes': ['short', 'standard', 'name', 'tagline'],
+    'PlayParameters': ['id', 'kind'],
+    'Preview': ['artwork: Artwork', 'url', 'hlsUrl'],
+    'Description': ['short', 'standard'],
+    'ViewAttributes': ['title'],
+    'DisplayString': ['stringForDisplay'],
+}
+
+# Resources: name -> api type, attributes, relationships and views.
+# Relationship and view data is built by `type` of every item, the class given
+# here is used only for items without known type.
+SCHEMA = {
+    'Albums': {
+        'type': 'albums',
+        'attributes': ['artistName', 'artistUrl', 'artwork: Artwork', 'audioVariants: list', 'contentRating',
+                        'copyright', 'editorialNotes: EditorialNotes', 'genreNames: list', 'isCompilation',
+                        'isComplete', 'isMasteredForItunes', 'isSingle', 'name', 'playParams: PlayParameters',
+                        'recordLabel', 'releaseDate', 'trackCount', 'upc', 'url'],
+        'relationships': {'artists': 'Artists', 'genres': 'Genres', 'tracks': 'Songs', 'library': 'LibraryAlbums',
+                        'record-labels': 'RecordLabels'},
+        'views': {'appears-on': 'Playlists', 'other-versions': 'Albums', 'related-albums': 'Albums',
+                'related-videos': 'MusicVideos'},
+    },
+    'LibraryAlbums': {
+        'type': 'library-albums',
+        'attributes': ['artistName', 'artwork: Artwork', 'contentRating', 'dateAdded', 'genreNames: list', 'name',
+                        'playParams: PlayParameters', 'releaseDate', 'trackCount'],
+        'relationships': {'artists': 'LibraryArtists', 'catalog': 'Albums', 'tracks': 'LibrarySongs'},
+    },
+    'Artists': {
+        'type': 'artists',
+        'attributes': ['artwork: Artwork', 'editorialNotes: EditorialNotes', 'genreNames: list', 'name', 'url'],
+        'relationships': {'albums': 'Albums', 'genres': 'Genres', 'music-videos': 'MusicVideos',
+                        'playlists': 'Playlists', 'station': 'Stations'},
+        'views': {'appears-on-albums': 'Albums', 'compilation-albums': 'Albums', 'featured-albums': 'Albums',
+                'featured-music-videos': 'MusicVideos', 'featured-playlists': 'Playlists', 'full-albums': 'Albums',
+                'latest-release': 'Albums', 'live-albums': 'Albums', 'more-to-hear': 'Artists',
+                'more-to-see': 'MusicVideos', 'music-videos': 'MusicVideos', 'playlists': 'Playlists',
+                'similar-artists': 'Artists', 'singles': 'Albums', 'top-music-videos': 'MusicVideos',
+                'top-songs': 'Songs'},
+    },
+    'LibraryArtists': {
+        'type': 'library-artists',
+        'attributes': ['name'],
+        'relationships': {'albums': 'LibraryAlbums', 'catalog': 'Artists'},
+    },
+    'Songs': {
+        'type': 'songs',
+        'attributes': ['albumName', 'artistName', 'artistUrl', 'artwork: Artwork', 'attribution', 'audioVariants: list',
+                        'composerName', 'contentRating', 'discNumber', 'durationInMillis',
+                        'editorialNotes: EditorialNotes', 'genreNames: list', 'hasLyrics', 'isAppleDigitalMaster',
+                        'isrc', 'movementCount', 'movementName', 'movementNumber', 'name',
+                        'playParams: PlayParameters', 'previews: [Preview]', 'releaseDate', 'trackNumber', 'url',
+                        'workName'],
+        'relationships': {'albums': 'Albums', 'artists': 'Artists', 'composers': 'Artists', 'genres': 'Genres',
+                        'library': 'LibrarySongs', 'music-videos': 'MusicVideos', 'station': 'Stations'},
+    },
+    'LibrarySongs': {
+        'type': 'library-songs',
+        'attributes': ['albumName', 'artistName', 'artwork: Artwork', 'contentRating', 'discNumber',
+                        'durationInMillis', 'genreNames: list', 'hasLyrics', 'name', 'playParams: PlayParameters',
+                        'releaseDate', 'trackNumber'],
+        'relationships': {'albums': 'LibraryAlbums', 'artists': 'LibraryArtists', 'catalog': 'Songs'},
+    },
+    'MusicVideos': {
+        'type': 'music-videos',
+        'attributes': ['albumName', 'artistName', 'artistUrl', 'artwork: Artwork', 'contentRating',
+                        'durationInMillis', 'editorialNotes: EditorialNotes', 'genreNames: list', 'has4K', 'hasHDR',
+                        'isrc', 'name', 'playParams: PlayParameters', 'previews: [Preview]', 'releaseDate',
+                        'trackNumber', 'url', 'videoSubType', 'workId', 'workName'],
+        'relationships': {'albums': 'Albums', 'artists': 'Artists', 'genres': 'Genres',
+                        'library': 'LibraryMusicVideos', 'songs': 'Songs'},
+        'views': {'more-by-artist': 'MusicVideos', 'more-in-genre': 'MusicVideos'},
+    },
+    'LibraryMusicVideos': {
+        'type': 'library-music-videos',
+        'attributes': ['albumName', 'artistName', 'artwork: Artwork', 'contentRating', 'durationInMillis',
+                        'genreNames: list', 'name', 'playParams: PlayParameters', 'releaseDate', 'trackNumber'],
+        'relationships': {'albums': 'LibraryAlbums', 'artists': 'LibraryArtists', 'catalog': 'MusicVideos'},
+    },
+    'Playlists': {
+        'type': 'playlists',
+        'attributes': ['artwork: Artwork', 'curatorName', 'description: Description',
+                        'editorialNotes: EditorialNotes', 'isChart', 'lastModifiedDate', 'name',
+                        'playParams: PlayParameters', 'playlistType', 'url'],
+        'relationships': {'curator': 'Curators', 'library': 'LibraryPlaylists', 'tracks': 'Songs'},
+        'views': {'featured-artists': 'Artists', 'more-by-curator': 'Playlists'},
+    },
+    'LibraryPlaylists': {
+        'type': 'library-playlists',
+        'attributes': ['artwork: Artwork', 'canEdit', 'dateAdded', 'description: Description', 'hasCatalog',
+                        'isPublic', 'lastModifiedDate', 'name', 'playParams: PlayParameters'],
+        'relationships': {'catalog': 'Playlists', 'tracks': 'LibrarySongs'},
+    },
+    'LibraryPlaylistFolders': {
+        'type': 'library-playlist-folders',
+        'attributes': ['dateAdded', 'name'],
+        'relationships': {'children': 'LibraryPlaylists', 'parent': 'LibraryPlaylistFolders'},
+    },
+    'Stations': {
+        'type': 'stations',
+        'attributes': ['artwork: Artwork', 'contentRating', 'durationInMillis', 'editorialNotes: EditorialNotes',
+                        'episodeNumber', 'isLive', 'mediaKind', 'name', 'playParams: PlayParameters',
+                        'stationProviderName', 'url'],
+    },
+    'StationGenres': {
+        'type': 'station-genres',
+        'attributes': ['name'],
+        'relationships': {'stations': 'Stations'},
+    },
+    'Genres': {
+        'type': 'genres',
+        'attributes': ['chartLabel', 'name', 'parentId', 'parentName'],
+        'relationships': {'parent': 'Genres'},
+    },
+    'RecordLabels': {
+        'type': 'record-labels',
+        'attributes': ['artwork: Artwork', 'description: Description', 'name', 'url'],
+        'views': {'latest-releases': 'Albums', 'top-releases': 'Albums'},
+    },
+    'Curators': {
+        'type': 'curators',
+        'attributes': ['artwork: Artwork', 'editorialNotes: EditorialNotes', 'name', 'url'],
+        'relationships': {'playlists': 'Playlists'},
+    },
+    'AppleCurators': {
+        'type': 'apple-curators',
+        'attributes': ['artwork: Artwork', 'editorialNotes: EditorialNotes', 'kind', 'name', 'shortName',
+                        'showHostName', 'url'],
+        'relationships': {'playlists': 'Playlists'},
+    },
+    'Activities': {
+        'type': 'activities',
+        'attributes': ['artwork: Artwork', 'editorialNotes: EditorialNotes', 'name', 'url'],
+        'relationships': {'playlists': 'Playlists'},
+    },
+    'Ratings': {
+        'type': 'ratings',
+        'attributes': ['value'],
+    },
+    'PersonalRecommendation': {
+        'type': 'personal-recommendation',
+        'attributes': ['kind', 'nextUpdateDate', 'reason: DisplayString', 'resourceTypes: list',
+                        'title: DisplayString'],
+        'relationships': {'contents': 'Albums'},
+    },
+}
+
+
+class field:
+    """
+    Attribute reading `key` of the wrapped dict on first access, converting it with `build`
+    when given, and keeping the result in slot `slot`
+    """
+
+    __slots__ = ('key', 'slot', 'build')
+
+    def __init__(self, key, slot, build = None):
+        self.key = key
+        self.slot = slot
+        self.build = build
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            pass
+
+        raw = instance._raw
+        value = raw.get(self.key) if raw is not None else None
+        if value is not None and self.build is not None:
+            value = self.build(value)
+        setattr(instance, self.slot, value)
+        return value
+
+
+class Resource:
+    """
+    Base of generated objects. `_fields` names their field attributes
+    """
+
+    __slots__ = ('_raw',)
+    _fields = ()
+
+    def __init__(self, raw : dict):
+        self._raw = raw if raw is not None else {}
+
+    @property
+    def resource(self):
+        return self._raw
+
+    def compact(self):
+        """
+        Reads every field, recursively, and drops the raw dict. Returns self
+        """
+        for name in self._fields:
+            value = getattr(self, name)
+            if isinstance(value, Resource):
+                value.compact()
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, Resource):
+                        item.compact()
+        self._raw = None
+        return self
+
+    def __repr__(self):
+        id = getattr(self, '_id', None)
+        return f'{type(self).__name__}({id!r})' if id is not None else f'{type(self).__name__}()'
+
+
+# Api type -> resource class, filled in by _generate
+TYPES = {}
+
+_classes = {}
+
+
+def resource(raw : dict, default = None):
+    """
+    Returns resource object of a class matching raw `type`
+    """
+    return TYPES.get(raw.get('type'), default or Resource)(raw)
+
+
+def _camel(key):
+    return ''.join(part[:1].upper() + part[1:] for part in key.split('-'))
+
+
+def _attribute(key):
+    return '_' + key.replace('-', '_')
+
+
+def _builder(spec):
+    if spec == 'list':
+        return list
+    if spec.startswith('['):
+        name = spec[1:-1]
+        return lambda items: [_classes[name](item) for item in items]
+    return lambda value: _classes[spec](value)
+
+
+def _class(name, fields, namespace = None, qualname = None):
+    """
+    Generates a slotted class with a field per (attribute, key, builder). `qualname`
+    is the dotted path reaching the class from the module, which pickle looks up
+    """
+    namespace = dict(namespace or {})
+    namespace['__qualname__'] = qualname or name
+    slots = []
+    for attribute, key, build in fields:
+        slot = '_v' + attribute
+        slots.append(slot)
+        namespace[attribute] = field(key, slot, build)
+
+    namespace['__slots__'] = tuple(slots)
+    namespace['_fields'] = tuple(attribute for attribute, _, _ in fields)
+    namespace['__module__'] = __name__
+    return type(name, (Resource,), namespace)
+
+
+def _parse(specs):
+    fields = []
+    nested = {}
+    for spec in specs:
+        key, _, kind = (part.strip() for part in spec.partition(':'))
+        fields.append((_attribute(key), key, _builder(kind) if kind else None))
+        if kind and kind != 'list':
+            nested[kind.strip('[]')] = kind.strip('[]')
+    return fields, nested
+
+
+def _collection(name, default, qualname):
+    build = lambda items: [resource(item, _classes[default]) for item in items]
+    return _class(name, [
+        ('_href', 'href', None),
+        ('_next', 'next', None),
+        ('_meta', 'meta', None),
+        ('_data', 'data', build)
+    ], qualname=qualname)
+
+
+def _view(name, default, qualname):
+    build = lambda items: [resource(item, _classes[default]) for item in items]
+    return _class(name, [
+        ('_href', 'href', None),
+        ('_next', 'next', None),
+        ('_attributes', 'attributes', _builder('ViewAttributes')),
+        ('_meta', 'meta', None),
+        ('_data', 'data', build)
+    ], {'Attributes': _classes['ViewAttributes']}, qualname)
+
+
+def _generate():
+    for name, specs in OBJECTS.items():
+        fields, _ = _parse(specs)
+        _classes[name] = _class(name, fields)
+
+    for name, schema in SCHEMA.items():
+        fields, nested = _parse(schema.get('attributes', []))
+        attributes = _class('Attributes', fields, {kind: _classes[kind] for kind in nested}, f'{name}.Attributes')
+
+        members = {'Attributes': attributes}
+        resource_fields = [
+            ('_id', 'id', None),
+            ('_type', 'type', None),
+            ('_href', 'href', None),
+            ('_attributes', 'attributes', attributes)
+        ]
+
+        if 'relationships' in schema:
+            relationships = {}
+            relationship_fields = []
+            for key, default in schema['relationships'].items():
+                relationship_name = f'{name}{_camel(key)}Relationship'
+                relationship = _collection(relationship_name, default, f'{name}.Relationships.{relationship_name}')
+                relationships[relationship_name] = relationship
+                relationship_fields.append((_attribute(key), key, relationship))
+            members['Relationships'] = _class('Relationships', relationship_fields, relationships, f'{name}.Relationships')
+            resource_fields.append(('_relationships', 'relationships', members['Relationships']))
+
+        if 'views' in schema:
+            views = {}
+            view_fields = []
+            for key, default in schema['views'].items():
+                view_name = f'{name}{_camel(key)}View'
+                view = _view(view_name, default, f'{name}.Views.{view_name}')
+                views[view_name] = view
+                view_fields.append((_attribute(key), key, view))
+            members['Views'] = _class('Views', view_fields, views, f'{name}.Views')
+            resource_fields.append(('_views', 'views', members['Views']))
+
+        cls = _class(name, resource_fields, members)
+        _classes[name] = cls
+        TYPES[schema['type']] = cls
+
+
+_generate()
+
+Albums = _classes['Albums']
+LibraryAlbums = _classes['LibraryAlbums']
+Artists = _classes['Artists']
+LibraryArtists = _classes['LibraryArtists']
+Songs = _classes['Songs']
+LibrarySongs = _classes['LibrarySongs']
+MusicVideos = _classes['MusicVideos']
+LibraryMusicVideos = _classes['LibraryMusicVideos']
+Playlists = _classes['Playlists']
+LibraryPlaylists = _classes['LibraryPlaylists']
+LibraryPlaylistFolders = _classes['LibraryPlaylistFolders']
+Stations = _classes['Stations']
+StationGenres = _classes['StationGenres']
+Genres = _classes['Genres']
+RecordLabels = _classes['RecordLabels']
+Curators = _classes['Curators']
+AppleCurators = _classes['AppleCurators']
+Activities = _classes['Activities']
+Ratings = _classes['Ratings']
+PersonalRecommendation = _classes['PersonalRecommendation']
+
+# Objects nested in attributes are shared by every resource, pickle finds them here
+Artwork = _classes['Artwork']
+EditorialNotes = _classes['EditorialNotes']
+PlayParameters = _classes['PlayParameters']
+Preview = _classes['Preview']
+Description = _classes['Description']
+ViewAttributes = _classes['ViewAttributes']
+DisplayString = _classes['DisplayString']
@@ -13,14 +13,11 @@ client = applemusicpy.Client(auth=auth)
 
 # Catalog albums
 ids = [1564530719, 1568819304]
-ids = [str(id) for id in ids]
 
-params = {
-    "ids": ','.join(ids)
-}
-
-response = client.albums(storefront='us', params=params, type=ResourceType.CATALOG)
-print(response)
+# Any number of ids is split into requests of allowed size and fetched concurrently
+response = client.albums(storefront='us', type=ResourceType.CATALOG, ids=ids)
+print(response['data'])
+print(response['meta']['missing'])
 
 # Library albums
 response = client.albums(type=ResourceType.LIBRARY)
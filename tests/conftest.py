@@ -0,0 +1,112 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+
+import pytest
+
+from applemusicpy import AuthBase, Client
+
+class StubAuth(AuthBase):
+
+    def __init__(self, developer_token = 'developer', user_token = 'user'):
+        self.developer_token = developer_token
+        self.user_token = user_token
+
+    def generate_developer_token(self):
+        return self.developer_token
+
+    def generate_user_token(self):
+        pass
+
+    def get_developer_token(self):
+        return self.developer_token
+
+    def get_user_token(self):
+        return self.user_token
+
+    def is_token_expired(self):
+        return False
+
+class Request:
+
+    def __init__(self, method, path, params, headers, body):
+        self.method = method
+        self.path = path
+        self.params = params
+        self.headers = headers
+        self.body = body
+
+def echo(request):
+    return 200, {'data': [{'id': request.path}]}, {}
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        parts = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        request = Request(self.command, parts.path, dict(parse_qsl(parts.query)),
+                        dict(self.headers), self.rfile.read(length) if length else b'')
+        with self.server.lock:
+            self.server.requests.append(request)
+
+        status, body, headers = self.server.handler(request)
+        body = json.dumps(body).encode('UTF-8') if body is not None else b''
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+class Server:
+    """
+    Stand-in for the Apple Music API answering every request with `handler(request)`,
+    a (status, JSON body or None, headers) tuple
+    """
+
+    def __init__(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.handler = echo
+        self._server.requests = []
+        self._server.lock = threading.Lock()
+        self.root = f'http://127.0.0.1:{self._server.server_address[1]}/v1/'
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    @property
+    def handler(self):
+        return self._server.handler
+
+    @handler.setter
+    def handler(self, handler):
+        self._server.handler = handler
+
+    @property
+    def requests(self):
+        return self._server.requests
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+@pytest.fixture
+def server():
+    server = Server()
+    yield server
+    server.close()
+
+@pytest.fixture
+def client(server):
+    client = Client(auth=StubAuth())
+    client.url_root = server.root
+    yield client
+    client.close()
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from applemusicpy import AsyncClient, AppleMusicHTTPException, RetryPolicy
+
+from conftest import StubAuth
+
+def run(client, coroutine):
+    async def main():
+        async with client:
+            return await coroutine(client)
+    return asyncio.run(main())
+
+@pytest.fixture
+def make_client(server):
+    def make(**kwargs):
+        client = AsyncClient(auth=StubAuth(), **kwargs)
+        client.url_root = server.root
+        return client
+    return make
+
+def test_requests_run_concurrently(server, make_client):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def handler(request):
+        with lock:
+            active.append(request)
+            peak.append(len(active))
+        time.sleep(0.2)
+        with lock:
+            active.remove(request)
+        return 200, {'data': [{'id': request.path.rsplit('/', 1)[1]}]}, {}
+    server.handler = handler
+
+    async def albums(client):
+        return await asyncio.gather(*(client.album(str(id), storefront='us') for id in range(10)))
+
+    start = time.monotonic()
+    albums = run(make_client(), albums)
+    assert [album['data'][0]['id'] for album in albums] == [str(id) for id in range(10)]
+    assert max(peak) == 10
+    assert time.monotonic() - start < 1
+
+def test_retries_until_success(server, make_client):
+    statuses = [503, 500, 200]
+    server.handler = lambda request: (statuses.pop(0), {'data': []}, {})
+
+    client = make_client(retry=RetryPolicy(max_retries=3, backoff_factor=0.01))
+    assert run(client, lambda client: client.album('1')) == {'data': []}
+    assert len(server.requests) == 3
+
+def test_gives_up_after_max_retries(server, make_client):
+    server.handler = lambda request: (503, {'errors': []}, {})
+
+    client = make_client(retry=RetryPolicy(max_retries=2, backoff_factor=0.01))
+    with pytest.raises(AppleMusicHTTPException) as error:
+        run(client, lambda client: client.album('1'))
+    assert error.value.status == 503
+    assert len(server.requests) == 3
+
+def test_close_releases_session_and_executor(server, make_client):
+    client = make_client()
+
+    async def requests(client):
+        await client.album('1')
+        return client._session, client._get_executor()
+
+    session, executor = run(client, requests)
+    assert session.closed
+    assert client._session is None
+    assert client._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
@@ -0,0 +1,56 @@
+import socket
+import threading
+import time
+import urllib.request
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from applemusicpy import Auth
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def auth():
+    auth = Auth(ec.generate_private_key(ec.SECP256R1()), 'key', 'team', port=free_port())
+    yield auth
+    auth.close()
+
+def test_user_flow_does_not_block_token_refresh(auth, monkeypatch):
+    monkeypatch.setattr('webbrowser.open', lambda url, new = 0: True)
+    flow = threading.Thread(target=auth.generate_user_token)
+    flow.start()
+    time.sleep(0.2)
+
+    # The user has not authorized yet, the developer token is still regenerated
+    auth._catalog_headers = None
+    refresh = threading.Thread(target=auth.get_catalog_headers, daemon=True)
+    refresh.start()
+    refresh.join(2)
+    blocked = refresh.is_alive()
+
+    root = f'http://127.0.0.1:{auth.port}'
+    urllib.request.urlopen(root).read()
+    urllib.request.urlopen(urllib.request.Request(root + '/token', data=b'music-user-token')).read()
+    flow.join(5)
+    assert auth.get_user_token() == 'music-user-token'
+    assert not blocked
+
+def test_background_refresh_is_opt_in():
+    key = ec.generate_private_key(ec.SECP256R1())
+    threads = threading.active_count()
+
+    auth = Auth(key, 'key', 'team')
+    auth.get_catalog_headers()
+    assert auth._refresh_timer is None
+    assert threading.active_count() == threads
+
+    with Auth(key, 'key', 'team', background_refresh=True) as auth:
+        auth.get_catalog_headers()
+        timer = auth._refresh_timer
+        assert timer.is_alive()
+    timer.join(1)
+    assert not timer.is_alive()
@@ -0,0 +1,42 @@
+from applemusicpy import MemoryCache, SQLiteCache
+
+def key(url):
+    return f'GET {url}'
+
+def test_sqlite_cache_keeps_total_size(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'cache.db'), max_bytes=10 ** 6)
+    for id in range(20):
+        cache.set(key(f'https://api/v1/catalog/us/albums/{id}'), {'data': [{'id': str(id)} for _ in range(id)]})
+    cache.set(key('https://api/v1/catalog/us/albums/3'), {'data': []})
+    cache.invalidate('https://api/v1/catalog/us/albums/1')
+
+    connection = cache._connect()
+    assert cache._total(connection) == connection.execute('SELECT SUM(size) FROM responses').fetchone()[0]
+    assert cache.stats()['size'] == 19
+
+    # A cache file of an earlier version starts its total from the stored rows
+    total = cache._total(connection)
+    for name in ('TRIGGER responses_insert', 'TRIGGER responses_update', 'TRIGGER responses_delete', 'TABLE totals'):
+        connection.execute(f'DROP {name}')
+    assert SQLiteCache(cache.path)._total(connection) == total
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'cache.db'), max_bytes=2000)
+    value = {'data': [{'id': str(id)} for id in range(200)]}
+    for id in range(20):
+        cache.set(key(f'https://api/v1/catalog/us/songs/{id}'), dict(value, id=id))
+
+    assert cache.stats()['bytes'] <= 2000
+    assert cache.get(key('https://api/v1/catalog/us/songs/19')) is not None
+    assert cache.get(key('https://api/v1/catalog/us/songs/0')) is None
+
+def test_invalidate_respects_path_boundaries(tmp_path):
+    for cache in (MemoryCache(), SQLiteCache(str(tmp_path / 'cache.db'))):
+        for id in ('1', '12', '1/tracks'):
+            cache.set(key(f'https://api/v1/catalog/us/albums/{id}'), {'id': id})
+        cache.set(key('https://api/v1/catalog/us/albums/1?include=tracks'), {'id': '1'})
+
+        cache.invalidate('https://api/v1/catalog/us/albums/1')
+        assert cache.get(key('https://api/v1/catalog/us/albums/12')) == {'id': '12'}
+        assert cache.get(key('https://api/v1/catalog/us/albums/1/tracks')) is None
+        assert cache.get(key('https://api/v1/catalog/us/albums/1?include=tracks')) is None
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from applemusicpy import AppleMusicClientException, AppleMusicHTTPException, Client, ResourceType, RetryPolicy
+
+from conftest import StubAuth
+
+def test_pages_follow_next_links(server, client):
+    def handler(request):
+        offset = int(request.params.get('offset', 0))
+        next = {'next': f'/v1/me/library/songs?offset={offset + 2}'} if offset < 4 else {}
+        return 200, {'data': [{'id': str(offset)}, {'id': str(offset + 1)}], **next}, {}
+    server.handler = handler
+
+    songs = client.paginate(client.songs, type=ResourceType.LIBRARY)
+    assert [song['id'] for song in songs] == [str(id) for id in range(6)]
+
+@pytest.mark.parametrize('status', [202, 204])
+def test_pages_stop_at_response_without_body(server, client, status):
+    server.handler = lambda request: (status, None, {})
+    assert list(client.pages(client.songs, type=ResourceType.LIBRARY)) == []
+
+def test_pages_reject_ids(server, client):
+    with pytest.raises(AppleMusicClientException):
+        list(client.pages(client.albums, ids=['1', '2']))
+    assert server.requests == []
+
+def test_map_runs_calls_concurrently(server, client):
+    def handler(request):
+        time.sleep(0.2)
+        return 200, {'data': [{'id': request.path.rsplit('/', 1)[1]}]}, {}
+    server.handler = handler
+
+    start = time.monotonic()
+    albums = client.map([(client.album, (str(id),)) for id in range(8)], workers=8)
+    assert [album['data'][0]['id'] for album in albums] == [str(id) for id in range(8)]
+    assert time.monotonic() - start < 1
+
+def test_retries_until_success(server):
+    statuses = [429, 503, 200]
+    server.handler = lambda request: (statuses.pop(0), {'data': []}, {'Retry-After': '0'})
+
+    with Client(auth=StubAuth(), retry=RetryPolicy(max_retries=3, backoff_factor=0.01)) as client:
+        client.url_root = server.root
+        assert client.album('1') == {'data': []}
+    assert len(server.requests) == 3
+
+def test_does_not_retry_post(server):
+    server.handler = lambda request: (503, {'errors': []}, {})
+
+    with Client(auth=StubAuth(), retry=RetryPolicy(max_retries=3, backoff_factor=0.01)) as client:
+        client.url_root = server.root
+        with pytest.raises(AppleMusicHTTPException):
+            client.add_resource({'ids[songs]': '1'})
+    assert len(server.requests) == 1
+
+def test_close_shuts_down_executor(server, client):
+    client.map([(client.album, ('1',))])
+    executor = client._get_executor()
+    client.close()
+    assert client._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+
+def test_songs_keeps_positional_id(server, client):
+    client.songs('123', storefront='us', params={'ids': '1,2'})
+    assert [(request.path, request.params) for request in server.requests] == [('/v1/catalog/us/songs', {'ids': '1,2'})]
+
+def test_songs_by_ids_are_chunked(server, client):
+    client.max_ids['songs'] = 2
+    server.handler = lambda request: (200, {'data': [{'id': id} for id in request.params['ids'].split(',')]}, {})
+
+    songs = client.songs(ids=['1', '2', '3'], storefront='us')
+    assert [song['id'] for song in songs['data']] == ['1', '2', '3']
+    assert sorted(request.params['ids'] for request in server.requests) == ['1,2', '3']
@@ -0,0 +1,45 @@
+import time
+
+from applemusicpy import Client, CatalogLoader
+
+from conftest import StubAuth
+
+def catalog(request):
+    data = []
+    for name, ids in request.params.items():
+        if name.startswith('ids['):
+            data.extend({'type': name[4:-1], 'id': id} for id in ids.split(','))
+    return 200, {'data': data}, {}
+
+def test_load_resolves_resources(server, client):
+    server.handler = catalog
+    with CatalogLoader(client, storefront='us') as loader:
+        song, album, missing = loader.load('songs', 1), loader.load('albums', '2'), loader.load('songs', '3')
+        assert song.result(timeout=5) == {'type': 'songs', 'id': '1'}
+        assert album.result(timeout=5) == {'type': 'albums', 'id': '2'}
+    assert len(server.requests) == 1
+    assert server.requests[0].path == '/v1/catalog/us'
+
+def test_full_batch_does_not_block_load(server, client):
+    def slow(request):
+        time.sleep(0.3)
+        return catalog(request)
+    server.handler = slow
+
+    with CatalogLoader(client, max_batch=2) as loader:
+        start = time.monotonic()
+        futures = loader.load_many([('songs', id) for id in '1234'])
+        assert time.monotonic() - start < 0.2
+        assert [future.result(timeout=5)['id'] for future in futures] == list('1234')
+
+def test_loads_resolve_inside_client_map(server):
+    server.handler = catalog
+    client = Client(auth=StubAuth(), workers=4)
+    client.url_root = server.root
+
+    with client, CatalogLoader(client, window=0.05) as loader:
+        def lookup(id):
+            return loader.load('songs', id).result(timeout=5)['id']
+
+        ids = [str(id) for id in range(8)]
+        assert client.map([(lookup, (id,)) for id in ids], workers=4) == ids
@@ -0,0 +1,34 @@
+import random
+import string
+
+from applemusicpy import LibraryIndex
+
+def song(id, name, artist):
+    return {'type': 'library-songs', 'id': id, 'attributes': {'name': name, 'artistName': artist}}
+
+def test_prefix_query_ranks_exact_matches_first():
+    index = LibraryIndex()
+    index.add_many([song('1', 'Shake It Off', 'Taylor Swift'), song('2', 'Swimming', 'Mac Miller'),
+                    song('3', 'Swift Boat', 'Taylors')])
+
+    assert [resource['id'] for _, resource in index.query('taylor swi')] == ['1', '3']
+    assert index.query('swimmingly') == []
+    assert index.search('mac', types=['library-songs'])['results']['library-songs']['data'][0]['id'] == '2'
+
+def test_add_many_matches_single_adds():
+    random.seed(7)
+    words = [''.join(random.choice(string.ascii_lowercase[:6]) for _ in range(4)) for _ in range(300)]
+    resources = [song(str(id % 150), ' '.join(random.sample(words, 3)), random.choice(words)) for id in range(400)]
+
+    single, bulk = LibraryIndex(), LibraryIndex()
+    for resource in resources:
+        single.add(resource)
+    bulk.add_many(resources)
+
+    assert bulk._tokens == single._tokens == sorted(single._postings)
+    for prefix in ('a', 'ab', 'cad', 'fff'):
+        assert bulk.query(prefix, limit=None) == single.query(prefix, limit=None)
+
+    bulk.remove('library-songs', '3')
+    single.remove('library-songs', '3')
+    assert bulk._tokens == single._tokens
@@ -0,0 +1,58 @@
+import pickle
+
+from applemusicpy import Albums, Songs
+
+ALBUM = {
+    'id': '1',
+    'type': 'albums',
+    'href': '/v1/catalog/us/albums/1',
+    'attributes': {
+        'name': 'Album',
+        'artwork': {'url': 'https://example.com/{w}x{h}.jpg', 'width': 3000, 'height': 3000},
+        'playParams': {'id': '1', 'kind': 'album'},
+        'genreNames': ['Pop']
+    },
+    'relationships': {
+        'tracks': {
+            'href': '/v1/catalog/us/albums/1/tracks',
+            'data': [{
+                'id': '2',
+                'type': 'songs',
+                'attributes': {
+                    'name': 'Song',
+                    'durationInMillis': 1000,
+                    'previews': [{'url': 'https://example.com/preview.m4a'}]
+                }
+            }]
+        }
+    },
+    'views': {
+        'appears-on': {'attributes': {'title': 'Appears On'}, 'data': [{'id': '3', 'type': 'playlists'}]}
+    }
+}
+
+def test_compacted_resource_pickles():
+    album = pickle.loads(pickle.dumps(Albums(ALBUM).compact()))
+
+    assert album._id == '1'
+    assert album._attributes._artwork._width == 3000
+    assert album._attributes._playParams._kind == 'album'
+    song = album._relationships._tracks._data[0]
+    assert isinstance(song, Songs)
+    assert song._attributes._previews[0]._url == 'https://example.com/preview.m4a'
+    assert album._views._appears_on._attributes._title == 'Appears On'
+
+def test_accessed_resource_pickles():
+    album = Albums(ALBUM)
+    album._relationships._tracks._data[0]._attributes._name
+    album._views._appears_on._data
+
+    album = pickle.loads(pickle.dumps(album))
+    assert album._relationships._tracks._data[0]._attributes._name == 'Song'
+    assert album._attributes._name == 'Album'
+
+def test_nested_names_stay_importable():
+    view = Albums.Views.AlbumsAppearsOnView({'attributes': {'title': 'Appears On'}})
+    assert isinstance(view._attributes, Albums.Views.AlbumsAppearsOnView.Attributes)
+    assert isinstance(Albums(ALBUM)._attributes._artwork, Albums.Attributes.Artwork)
+    assert Albums.Relationships.AlbumsTracksRelationship is type(Albums(ALBUM)._relationships._tracks)